@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'SmartCitySystem.settings')
 
 application = get_asgi_application()
+
+# Parse templates now rather than on each worker's first requests
+from complaints.rendering import warm_template_cache  # noqa: E402
+
+warm_template_cache()
@@ -44,44 +44,95 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # Add WhiteNoise for static files
+    'complaints.middleware.AsyncWhiteNoiseMiddleware',  # WhiteNoise for static files, ASGI-capable
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'complaints.middleware.RequestTimingMiddleware',
+    'complaints.middleware.ReplicaPinMiddleware',
 ]
 
 ROOT_URLCONF = 'SmartCitySystem.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # The stock Django backend, with render time reported per request
+        # (see complaints/perf.py)
+        'BACKEND': 'complaints.perf.TimedDjangoTemplates',
+        'NAME': 'django',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Compiled templates are kept per process, so base.html is parsed
+            # once rather than on every render (the WSGI/ASGI entry points
+            # warm them at startup). Under DEBUG the autoreloader clears
+            # the cache when a template changes.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'complaints.context_processors.unread_messages',
             ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'SmartCitySystem.wsgi.application'
+ASGI_APPLICATION = 'SmartCitySystem.asgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Connections are checked before reuse (CONN_HEALTH_CHECKS), so one
+# killed by a database failover is replaced instead of failing a request.
+# By default each worker keeps its connections for DB_CONN_MAX_AGE
+# seconds. Under ASGI every concurrent request can hold its own, so with
+# many workers set DB_POOL=true: each worker process then shares a psycopg
+# pool of at most DB_POOL_MAX_SIZE connections and requests wait up to
+# DB_POOL_TIMEOUT seconds for one. `check --database default` (run by
+# start.sh) verifies WEB_CONCURRENCY workers fit the server's
+# max_connections, keeping DB_RESERVED_CONNECTIONS free for the
+# notification worker, migrations and psql.
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=600, cast=int)
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+DB_POOL_MIN_SIZE = config('DB_POOL_MIN_SIZE', default=2, cast=int)
+DB_POOL_MAX_SIZE = config('DB_POOL_MAX_SIZE', default=4, cast=int)
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', default=10, cast=float)
+DB_RESERVED_CONNECTIONS = config('DB_RESERVED_CONNECTIONS', default=5, cast=int)
+WEB_CONCURRENCY = config('WEB_CONCURRENCY', default=2, cast=int)
+SERVER_MODE = config('SERVER_MODE', default='wsgi')
+
+
+def database_from_url(url):
+    import dj_database_url
+    database = dj_database_url.parse(url, conn_max_age=0 if DB_POOL else DB_CONN_MAX_AGE,
+                                     conn_health_checks=True)
+    if database['ENGINE'] == 'django.db.backends.postgresql':
+        # Same backend, plus connect / pool wait time in the request metrics
+        database['ENGINE'] = 'complaints.postgresql'
+        if DB_POOL:
+            database.setdefault('OPTIONS', {})['pool'] = {
+                'min_size': DB_POOL_MIN_SIZE,
+                'max_size': DB_POOL_MAX_SIZE,
+                'timeout': DB_POOL_TIMEOUT,
+            }
+    return database
+
+
 # Use PostgreSQL on Render, SQLite locally
 DATABASE_URL = config('DATABASE_URL', default='')
 if DATABASE_URL:
-    import dj_database_url
     DATABASES = {
-        'default': dj_database_url.parse(DATABASE_URL, conn_max_age=600)
+        'default': database_from_url(DATABASE_URL)
     }
 else:
     DATABASES = {
@@ -91,6 +142,79 @@ else:
         }
     }
 
+# Optional read replica. Read-only list pages and exports read from it (see
+# complaints/routing.py); after any write a user stays on the primary for
+# REPLICA_PIN_SECONDS so they see their own changes despite replication lag.
+# Locally, READ_REPLICA_URL=sqlite:///replica.sqlite3 plus
+# `python manage.py sync_sqlite_replica` stands in for a real replica.
+READ_REPLICA_URL = config('READ_REPLICA_URL', default='')
+READ_REPLICA_ALIAS = 'replica' if READ_REPLICA_URL else None
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+if READ_REPLICA_URL:
+    DATABASES[READ_REPLICA_ALIAS] = database_from_url(READ_REPLICA_URL)
+    # Tests read the replica alias from the test database itself
+    DATABASES[READ_REPLICA_ALIAS]['TEST'] = {'MIRROR': 'default'}
+DATABASE_ROUTERS = ['complaints.routing.ReplicaRouter']
+
+
+# Cache
+# CACHE_BACKEND picks the backend: 'locmem' (default), 'file' or 'redis'
+# (requires REDIS_URL). Local memory is private to each gunicorn worker,
+# so use 'redis' in production to share cached fragments and
+# invalidations between workers.
+REDIS_URL = config('REDIS_URL', default='')
+CACHE_BACKEND = config('CACHE_BACKEND', default='redis' if REDIS_URL else 'locmem')
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': config('CACHE_LOCATION', default=str(BASE_DIR / '.django_cache')),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'smartcity',
+        }
+    }
+# Whether every worker process sees the same cache entries
+SHARED_CACHE = CACHE_BACKEND != 'locmem'
+
+# With a cache shared by every worker (redis, file), sessions are read
+# from it and only written through to the database when they change. A
+# locmem cache is private to each process, so a logout handled by one
+# worker would leave the session alive in the others: sessions then go
+# straight to the database (complaints.checks rejects cached sessions on
+# locmem outside DEBUG). Flash messages live in a signed cookie so
+# messages.success() never rewrites the session row.
+SESSION_ENGINE = config(
+    'SESSION_ENGINE',
+    default='django.contrib.sessions.backends.cached_db' if SHARED_CACHE
+    else 'django.contrib.sessions.backends.db',
+)
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
+# Per-user dashboard fragments (see complaints/fragments.py). Invalidation
+# bumps a version in the cache, which other workers never see with locmem,
+# so there a fragment lives only a few seconds.
+FRAGMENT_CACHE_SECONDS = config('FRAGMENT_CACHE_SECONDS', default=600 if SHARED_CACHE else 10, cast=int)
+
+# Live complaint status events (server-sent events on the citizen dashboard).
+# 'local' fans out within one process only; 'redis' reaches clients on every
+# worker through Redis pub/sub (requires REDIS_URL).
+COMPLAINT_EVENTS_BACKEND = config('COMPLAINT_EVENTS_BACKEND', default='redis' if REDIS_URL else 'local')
+SSE_KEEPALIVE_SECONDS = config('SSE_KEEPALIVE_SECONDS', default=15, cast=float)
+SSE_STREAM_SECONDS = config('SSE_STREAM_SECONDS', default=300, cast=float)
+SSE_RETRY_MILLISECONDS = 5000
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -135,8 +259,21 @@ STATICFILES_DIRS = [
 # Static files collection directory for production
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
-# WhiteNoise configuration for serving static files
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# WhiteNoise configuration for serving static files. Outside DEBUG,
+# collectstatic writes content-hashed copies with gzip/brotli siblings, and
+# WhiteNoise serves the hashed names with a far-future immutable
+# Cache-Control. DEBUG serves the sources so no collectstatic is needed.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+            else 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -144,13 +281,79 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Email Configuration
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+# Mail goes through a timing wrapper around EMAIL_DELIVERY_BACKEND so the
+# time spent sending shows up in the request metrics.
+EMAIL_BACKEND = 'complaints.perf.TimedEmailBackend'
+EMAIL_DELIVERY_BACKEND = config('EMAIL_DELIVERY_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = 'localhost'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = ''
 EMAIL_HOST_PASSWORD = ''
 
+# Notification outbox (delivered by `python manage.py dispatch_notifications`)
+NOTIFICATION_BATCH_SIZE = config('NOTIFICATION_BATCH_SIZE', default=100, cast=int)
+NOTIFICATION_POLL_SECONDS = config('NOTIFICATION_POLL_SECONDS', default=5, cast=float)
+NOTIFICATION_MAX_ATTEMPTS = config('NOTIFICATION_MAX_ATTEMPTS', default=5, cast=int)
+NOTIFICATION_RETRY_BASE_SECONDS = 60
+NOTIFICATION_RETRY_MAX_SECONDS = 3600
+NOTIFICATION_LEASE_SECONDS = 300
+
+# Cached dashboard counters (see complaints/stats.py); short-lived with
+# locmem for the same reason as FRAGMENT_CACHE_SECONDS
+COMPLAINT_STATS_CACHE_SECONDS = config(
+    'COMPLAINT_STATS_CACHE_SECONDS', default=300 if SHARED_CACHE else 10, cast=int,
+)
+
+# Rows per bulk_create when broadcasting a message to a segment
+BROADCAST_CHUNK_SIZE = 1000
+
+# Archiving (`python manage.py archive_records`): complaints resolved and
+# bills cleared longer ago than this move out of the hot tables
+ARCHIVE_AFTER_DAYS = config('ARCHIVE_AFTER_DAYS', default=90, cast=int)
+ARCHIVE_BATCH_SIZE = config('ARCHIVE_BATCH_SIZE', default=500, cast=int)
+
+# Request metrics (see complaints/perf.py). Every request logs one JSON
+# line on the `complaints.perf` logger; set PERF_LOG_FILE to also append
+# them to a file for `python manage.py perf_report`.
+PERF_LOG_FILE = config('PERF_LOG_FILE', default='')
+# Server-Timing and the worker-wide cache counters go out as response
+# headers only when PERF_HEADERS is on; otherwise they are only logged.
+PERF_HEADERS = config('PERF_HEADERS', default=DEBUG, cast=bool)
+PERF_LOG_HANDLERS = ['perf_file'] if PERF_LOG_FILE else []
+if not DEBUG:
+    PERF_LOG_HANDLERS.append('console')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'message',
+        },
+        **({'perf_file': {
+            'class': 'logging.handlers.WatchedFileHandler',
+            'filename': PERF_LOG_FILE,
+            'formatter': 'message',
+        }} if PERF_LOG_FILE else {}),
+    },
+    'loggers': {
+        'complaints': {
+            'handlers': ['console'],
+            'level': config('LOG_LEVEL', default='INFO'),
+        },
+        'complaints.perf': {
+            'handlers': PERF_LOG_HANDLERS,
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 # Login URLs
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/citizen-dashboard/'
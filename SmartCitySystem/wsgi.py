@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'SmartCitySystem.settings')
 
 application = get_wsgi_application()
+
+# Parse templates now rather than on each worker's first requests
+from complaints.rendering import warm_template_cache  # noqa: E402
+
+warm_template_cache()
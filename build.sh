@@ -8,7 +8,9 @@ pip install -r requirements.txt
 # Run migrations
 python manage.py migrate --noinput
 
-# Collect static files
+# Resize/re-encode responsive images, then collect static files (hashed
+# names plus precompressed .gz/.br copies)
+python manage.py build_image_variants
 python manage.py collectstatic --noinput --clear
 
 
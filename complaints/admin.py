@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Complaint, ElectricityBill
+from .models import ArchivedComplaint, ArchivedElectricityBill, Complaint, ElectricityBill, NotificationOutbox
 
 
 @admin.register(Complaint)
@@ -28,6 +28,13 @@ class ElectricityBillAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at', 'updated_at')
     list_editable = ('status',)
     
+    def get_search_results(self, request, queryset, search_term):
+        # Exact bill numbers hit the unique index; skip the multi-field ILIKE
+        exact = queryset.filter(bill_number=search_term.strip())
+        if search_term.strip() and exact.exists():
+            return exact, False
+        return super().get_search_results(request, queryset, search_term)
+    
     fieldsets = (
         ('Bill Information', {
             'fields': ('user', 'bill_number', 'consumer_name', 'address', 'amount', 'due_date')
@@ -35,4 +42,35 @@ class ElectricityBillAdmin(admin.ModelAdmin):
         ('Status Information', {
             'fields': ('status', 'created_at', 'updated_at')
         }),
-    )
\ No newline at end of file
+    )
+
+
+class ArchiveAdmin(admin.ModelAdmin):
+    """Archived rows are kept for reference and cannot be edited."""
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedComplaint)
+class ArchivedComplaintAdmin(ArchiveAdmin):
+    list_display = ('title', 'user', 'category', 'status', 'created_at', 'archived_at')
+    list_filter = ('category',)
+    search_fields = ('title', 'user__username')
+
+
+@admin.register(ArchivedElectricityBill)
+class ArchivedElectricityBillAdmin(ArchiveAdmin):
+    list_display = ('bill_number', 'user', 'consumer_name', 'amount', 'due_date', 'archived_at')
+    search_fields = ('bill_number', 'consumer_name', 'user__username')
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'recipient', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject', 'recipient')
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
\ No newline at end of file
@@ -6,4 +6,5 @@ class ComplaintsConfig(AppConfig):
     name = 'complaints'
     
     def ready(self):
+        import complaints.checks
         import complaints.signals
\ No newline at end of file
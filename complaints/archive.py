@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ArchivedComplaint, ArchivedElectricityBill, Complaint, ElectricityBill
+from .stats import ComplaintStats
+
+# name -> (hot model, archive model, status that makes a row archivable)
+ARCHIVES = {
+    'complaints': (Complaint, ArchivedComplaint, 'Resolved'),
+    'bills': (ElectricityBill, ArchivedElectricityBill, 'Cleared'),
+}
+
+
+def include_archive(request):
+    """Whether the list should show archived rows as well (``?archive=1``)."""
+    return request.GET.get('archive') == '1'
+
+
+def archivable(model, status, days):
+    """Rows in ``status`` that have not been touched for ``days`` days."""
+    cutoff = timezone.now() - timedelta(days=days)
+    return model.objects.filter(status=status, updated_at__lt=cutoff)
+
+
+def archive_batch(name, days, batch_size):
+    """Move up to ``batch_size`` archivable rows into the archive table.
+
+    Copy and delete happen in one transaction, so an interrupted run leaves
+    every row in exactly one table and the next run picks up where it
+    stopped. On PostgreSQL the rows are locked first, so a row edited
+    meanwhile is either archived before the edit or left alone. Returns the
+    number of rows moved.
+    """
+    model, archive_model, status = ARCHIVES[name]
+    fields = [field.attname for field in model._meta.concrete_fields]
+    with transaction.atomic():
+        rows = list(
+            archivable(model, status, days)
+            .order_by('pk')
+            .select_for_update(skip_locked=True)[:batch_size]
+        )
+        if not rows:
+            return 0
+        archived_at = timezone.now()
+        archive_model.objects.bulk_create([
+            archive_model(archived_at=archived_at, **{field: getattr(row, field) for field in fields})
+            for row in rows
+        ])
+        # Deleting through the ORM keeps the dashboard fragment versions in
+        # step (see signals); the city-wide stats count both tables.
+        model.objects.filter(pk__in=[row.pk for row in rows]).delete()
+        if model is Complaint:
+            transaction.on_commit(ComplaintStats.invalidate)
+    return len(rows)
+
+
+def merge_totals(*totals):
+    """Add up ElectricityBillQuerySet.totals() results."""
+    merged = dict(totals[0])
+    for other in totals[1:]:
+        for key, value in other.items():
+            merged[key] += value
+    return merged
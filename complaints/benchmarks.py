@@ -0,0 +1,161 @@
+import json
+import statistics
+import time
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import Complaint, ElectricityBill, Message
+from .perf import percentile
+
+# Query strings that make a URL do its real work
+QUERY_STRINGS = {
+    'search_complaints': '?q=complaint',
+}
+
+# Query counts are the hard gate. Latency depends on the machine, so a URL
+# is only slower when its median is this much above the baseline (as a
+# fraction) and also by at least MIN_REGRESSION_MS, and bench_urls measures
+# it again before failing (see slowdowns()).
+DEFAULT_THRESHOLD = 0.25
+MIN_REGRESSION_MS = 25.0
+
+# Benchmarks start from an empty cache of their own: clearing the configured
+# one could wipe a shared Redis (sessions, fragments, stats) in production.
+ISOLATED_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'benchmarks',
+    }
+}
+
+# Pages are measured with sessions read from the cache, as they are behind
+# a shared cache in production; the benchmark process is the only one
+# using ISOLATED_CACHES, so that is safe here even though it is locmem.
+CACHED_SESSIONS = 'django.contrib.sessions.backends.cached_db'
+
+
+def url_cases(citizen, admin):
+    """url name -> (user to log in as, URL) for a GET of every complaints URL.
+
+    Detail pages use one of ``citizen``'s own complaints, bills and messages.
+    """
+    complaint = Complaint.objects.filter(user=citizen).first()
+    bill = ElectricityBill.objects.filter(user=citizen).first()
+    message = Message.objects.filter(recipient=citizen).first()
+    cases = {
+        'home': (None, {}),
+        'register': (None, {}),
+        'login': (None, {}),
+        'logout': (citizen, {}),
+        'citizen_dashboard': (citizen, {}),
+        'complaint_events': (citizen, {}),
+        'add_complaint': (citizen, {}),
+        'edit_complaint': (citizen, {'complaint_id': complaint.pk}),
+        'delete_complaint': (citizen, {'complaint_id': complaint.pk}),
+        'search_complaints': (admin, {}),
+        'admin_dashboard': (admin, {}),
+        'admin_edit_complaint': (admin, {'complaint_id': complaint.pk}),
+        'admin_delete_complaint': (admin, {'complaint_id': complaint.pk}),
+        'export_complaints': (admin, {}),
+        'electricity_bills': (citizen, {}),
+        'add_electricity_bill': (admin, {}),
+        'edit_electricity_bill': (citizen, {'bill_id': bill.pk}),
+        'delete_electricity_bill': (citizen, {'bill_id': bill.pk}),
+        'mark_bill_cleared': (citizen, {'bill_id': bill.pk}),
+        'admin_electricity_bills': (admin, {}),
+        'export_bills': (admin, {}),
+        'admin_edit_electricity_bill': (admin, {'bill_id': bill.pk}),
+        'admin_delete_electricity_bill': (admin, {'bill_id': bill.pk}),
+        'user_messages': (citizen, {}),
+        'view_message': (citizen, {'message_id': message.pk}),
+        'mark_messages_read': (citizen, {}),
+        'send_message': (admin, {}),
+        'send_broadcast': (admin, {}),
+        'recipient_autocomplete': (admin, {}),
+        'admin_messages': (admin, {}),
+    }
+    return {
+        name: (user, reverse(name, kwargs=kwargs) + QUERY_STRINGS.get(name, ''))
+        for name, (user, kwargs) in cases.items()
+    }
+
+
+def fetch(client, url):
+    """GET ``url``, reading streamed bodies so their queries are counted."""
+    response = client.get(url)
+    # Event streams never end; only opening them is measured.
+    if response.streaming and not response.is_async:
+        b''.join(response.streaming_content)
+    return response
+
+
+def measure(cases, iterations=20):
+    """Time ``iterations`` GETs of each case after one warm-up request.
+
+    Returns url name -> median/p95 latency in ms and the query count of
+    the last request.
+    """
+    client = Client()
+    results = {}
+    for name, (user, url) in cases.items():
+        timings = []
+        for iteration in range(iterations + 1):
+            client.logout()
+            if user is not None:
+                client.force_login(user)
+            # CaptureQueriesContext miscounts once the query log wraps
+            connection.queries_log.clear()
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = fetch(client, url)
+                elapsed = (time.perf_counter() - start) * 1000
+            if response.status_code >= 400:
+                raise ValueError(f'{name}: GET {url} returned {response.status_code}')
+            if iteration:
+                timings.append(elapsed)
+        results[name] = {
+            'median_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'queries': len(queries),
+        }
+    return results
+
+
+def query_regressions(baseline, results):
+    """Describe every URL that runs more queries than its baseline."""
+    return [
+        f"{name}: {current['queries']} queries, baseline {baseline[name]['queries']}"
+        for name, current in sorted(results.items())
+        if name in baseline and current['queries'] > baseline[name]['queries']
+    ]
+
+
+def slowdowns(baseline, results, threshold=DEFAULT_THRESHOLD):
+    """url name -> description of every URL whose median is well above its baseline."""
+    slow = {}
+    for name, current in sorted(results.items()):
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        limit = max(previous['median_ms'] * (1 + threshold), previous['median_ms'] + MIN_REGRESSION_MS)
+        if current['median_ms'] > limit:
+            slow[name] = (
+                f"{name}: median {current['median_ms']:.2f}ms, baseline {previous['median_ms']:.2f}ms "
+                f"(+{current['median_ms'] / previous['median_ms'] - 1:.0%})"
+            )
+    return slow
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def write_baseline(path, settings, results):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump({'settings': settings, 'urls': results}, handle, indent=2, sort_keys=True)
+        handle.write('\n')
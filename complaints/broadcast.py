@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.db import transaction
+
+from .models import Message, UserProfile
+from .segments import resolve_segment
+
+
+def broadcast_message(sender, segment, subject, content, priority, category=None):
+    """Send the same message to every user in ``segment``.
+
+    Rows are written with chunked ``bulk_create`` inside one transaction, so
+    either every recipient gets the message or none do. ``bulk_create``
+    skips ``post_save``, so unread counters are bumped per chunk here.
+    Returns the number of recipients.
+    """
+    chunk_size = settings.BROADCAST_CHUNK_SIZE
+    recipient_ids = list(resolve_segment(segment, category))
+    with transaction.atomic():
+        for start in range(0, len(recipient_ids), chunk_size):
+            chunk = recipient_ids[start:start + chunk_size]
+            Message.objects.bulk_create([
+                Message(
+                    sender=sender,
+                    recipient_id=recipient_id,
+                    subject=subject,
+                    content=content,
+                    priority=priority,
+                )
+                for recipient_id in chunk
+            ])
+            UserProfile.increment_unread_many(chunk)
+    return len(recipient_ids)
@@ -0,0 +1,124 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+from django.db import connections
+
+
+def pool_options(settings_dict):
+    """The psycopg pool options of a database, or None if it is not pooled."""
+    options = settings_dict.get('OPTIONS', {}).get('pool')
+    if options is True:
+        return {}
+    return options or None
+
+
+def pool_sizes(options):
+    """(min_size, max_size) with psycopg_pool's defaults filled in."""
+    min_size = options.get('min_size', 4)
+    return min_size, options.get('max_size', min_size)
+
+
+def is_postgresql(settings_dict):
+    return settings_dict['ENGINE'] in ('django.db.backends.postgresql', 'complaints.postgresql')
+
+
+def connections_per_worker(settings_dict):
+    """Most connections one web worker process can hold, or None if unbounded."""
+    options = pool_options(settings_dict)
+    if options is not None:
+        return pool_sizes(options)[1]
+    if settings.SERVER_MODE == 'asgi':
+        # Each concurrent request runs its sync code on its own thread
+        return None
+    return 1
+
+
+def server_connection_limit(connection):
+    """Connections the server accepts from non-superusers."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT current_setting('max_connections')::int"
+                       " - current_setting('superuser_reserved_connections')::int")
+        return cursor.fetchone()[0]
+
+
+@register()
+def check_database_pooling(app_configs, **kwargs):
+    errors = []
+    postgresql = [alias for alias, database in settings.DATABASES.items() if is_postgresql(database)]
+    for alias, database in settings.DATABASES.items():
+        options = pool_options(database)
+        if options is None:
+            continue
+        try:
+            import psycopg  # noqa: F401
+            import psycopg_pool  # noqa: F401
+        except ImportError:
+            errors.append(Error(
+                f'Database "{alias}" is pooled but psycopg 3 with its pool package is not installed.',
+                hint='pip install "psycopg[binary,pool]"',
+                id='complaints.E001',
+            ))
+        min_size, max_size = pool_sizes(options)
+        if min_size > max_size:
+            errors.append(Error(
+                f'Database "{alias}" has a pool min_size larger than its max_size.',
+                hint='Lower DB_POOL_MIN_SIZE or raise DB_POOL_MAX_SIZE.',
+                id='complaints.E002',
+            ))
+    if settings.DB_POOL and not postgresql:
+        errors.append(Warning(
+            'DB_POOL is set but no database uses PostgreSQL, so nothing is pooled.',
+            id='complaints.W001',
+        ))
+    for alias in postgresql:
+        if connections_per_worker(settings.DATABASES[alias]) is None:
+            errors.append(Warning(
+                f'Under ASGI every concurrent request can open its own connection to "{alias}".',
+                hint='Set DB_POOL=true to cap connections per worker.',
+                id='complaints.W002',
+            ))
+    return errors
+
+
+@register(Tags.caches)
+def check_session_cache(app_configs, **kwargs):
+    """Cached sessions need a cache every worker process shares."""
+    if settings.DEBUG or settings.SESSION_ENGINE not in (
+        'django.contrib.sessions.backends.cache',
+        'django.contrib.sessions.backends.cached_db',
+    ):
+        return []
+    backend = settings.CACHES[settings.SESSION_CACHE_ALIAS]['BACKEND']
+    if backend != 'django.core.cache.backends.locmem.LocMemCache':
+        return []
+    return [Error(
+        'Sessions are cached in a per-process locmem cache, so a logout in one '
+        'worker leaves the session alive in the others.',
+        hint='Set CACHE_BACKEND to redis or file, or use SESSION_ENGINE=django.contrib.sessions.backends.db.',
+        id='complaints.E004',
+    )]
+
+
+@register(Tags.database)
+def check_connection_budget(app_configs, databases=None, **kwargs):
+    """Whether all web workers at full pool size fit the server's max_connections.
+
+    Database checks only run when asked for (``check --database``, migrate),
+    since they need a live connection.
+    """
+    errors = []
+    for alias in databases or ():
+        connection = connections[alias]
+        per_worker = connections_per_worker(connection.settings_dict)
+        if connection.vendor != 'postgresql' or per_worker is None:
+            continue
+        limit = server_connection_limit(connection)
+        needed = settings.WEB_CONCURRENCY * per_worker + settings.DB_RESERVED_CONNECTIONS
+        if needed > limit:
+            errors.append(Error(
+                f'{settings.WEB_CONCURRENCY} workers x {per_worker} connections plus '
+                f'{settings.DB_RESERVED_CONNECTIONS} reserved need {needed} connections to "{alias}", '
+                f'but the server allows {limit}.',
+                hint='Lower WEB_CONCURRENCY or DB_POOL_MAX_SIZE, or put PgBouncer in front of the database.',
+                id='complaints.E003',
+            ))
+    return errors
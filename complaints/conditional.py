@@ -0,0 +1,126 @@
+import hashlib
+from collections import Counter
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .models import UserProfile
+
+# Process-wide conditional GET outcomes, reported by RequestTimingMiddleware
+CONDITIONAL_STATS = Counter()
+
+
+def resource_state(queryset, *date_fields):
+    """Row count and latest value of each date field, in one aggregate query.
+
+    Together they change whenever a row is added, edited or deleted.
+    """
+    return queryset.order_by().aggregate(
+        count=Count('pk'), **{field: Max(field) for field in date_fields}
+    )
+
+
+async def aresource_state(queryset, *date_fields):
+    return await queryset.order_by().aaggregate(
+        count=Count('pk'), **{field: Max(field) for field in date_fields}
+    )
+
+
+def unread_state(request):
+    """The navbar badge count, kept on the request for the context processor."""
+    request.unread_message_count = (
+        UserProfile.objects.filter(user_id=request.user.pk)
+        .values_list('unread_messages', flat=True)
+        .first()
+    ) or 0
+    return request.unread_message_count
+
+
+async def aunread_state(request):
+    request.unread_message_count = await (
+        UserProfile.objects.filter(user_id=request.user.pk)
+        .values_list('unread_messages', flat=True)
+        .afirst()
+    ) or 0
+    return request.unread_message_count
+
+
+def _validators(request, state):
+    dates = [
+        value for part in state if isinstance(part, dict)
+        for key, value in part.items() if key != 'count' and value is not None
+    ]
+    last_modified = int(max(dates).timestamp()) if dates else None
+    # The rendered page also depends on who is asking and on the CSRF
+    # secret behind any form tokens it embeds.
+    raw = '|'.join([
+        str(request.user.pk),
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+        repr(state),
+    ])
+    etag = '"%s"' % hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+    return etag, last_modified
+
+
+def _pre_process(request, state):
+    if state is None or request.method not in ('GET', 'HEAD'):
+        return None, None, None
+    if len(get_messages(request)):
+        # Pending flash messages are rendered (and consumed) by the page.
+        return None, None, None
+    etag, last_modified = _validators(request, state)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    return response, etag, last_modified
+
+
+def _post_process(response, etag, last_modified):
+    if etag is None:
+        return response
+    CONDITIONAL_STATS['not_modified' if response.status_code == 304 else 'rendered'] += 1
+    response.headers.setdefault('ETag', etag)
+    if last_modified and not response.has_header('Last-Modified'):
+        response.headers['Last-Modified'] = http_date(last_modified)
+    # Let the browser keep the page, but have it revalidate every time.
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_page(state_func):
+    """Answer a GET with 304 Not Modified when the page's data is unchanged.
+
+    ``state_func(request, *args, **kwargs)`` returns a list of cheap
+    snapshots of everything the page renders (see resource_state and
+    unread_state), or None to skip the check. It runs before the view, so
+    an unchanged page costs only those queries and no template rendering.
+    For async views it must be a coroutine function.
+    """
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def inner(request, *args, **kwargs):
+                state = await state_func(request, *args, **kwargs)
+                response, etag, last_modified = _pre_process(request, state)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return _post_process(response, etag, last_modified)
+
+        else:
+
+            @wraps(view)
+            def inner(request, *args, **kwargs):
+                state = state_func(request, *args, **kwargs)
+                response, etag, last_modified = _pre_process(request, state)
+                if response is None:
+                    response = view(request, *args, **kwargs)
+                return _post_process(response, etag, last_modified)
+
+        return inner
+
+    return decorator
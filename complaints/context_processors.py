@@ -0,0 +1,17 @@
+from .models import UserProfile
+
+
+def unread_messages(request):
+    """Expose the signed-in user's unread message count for the navbar badge."""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {}
+    if hasattr(request, 'unread_message_count'):
+        # Already read by a conditional_page state function
+        return {'unread_message_count': request.unread_message_count}
+    count = (
+        UserProfile.objects.filter(user_id=user.pk)
+        .values_list('unread_messages', flat=True)
+        .first()
+    )
+    return {'unread_message_count': count or 0}
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+STATUS_CHANNEL = 'complaints:status'
+
+
+def live_updates_available(request):
+    """Whether this server can hold an SSE stream open.
+
+    Under WSGI an async stream is buffered to completion on a sync worker,
+    so the client gets nothing live and the worker is blocked meanwhile.
+    """
+    return isinstance(request, ASGIRequest)
+
+
+class LocalBroker:
+    """In-process pub/sub of per-user events.
+
+    Subscribers are asyncio queues owned by SSE streams on this worker's
+    event loop. ``publish`` may be called from any thread (sync views run in
+    a thread pool under ASGI), so delivery is handed to the subscriber's loop.
+    This only reaches clients connected to the same process; it stands in
+    for RedisBroker when there is a single worker (development, tests).
+    """
+
+    QUEUE_SIZE = 100
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, user_id):
+        queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[user_id].add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, user_id, queue):
+        with self._lock:
+            subscribers = self._subscribers[user_id]
+            subscribers.difference_update({s for s in subscribers if s[1] is queue})
+            if not subscribers:
+                del self._subscribers[user_id]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, user_id, event):
+        self.deliver(user_id, event)
+
+    def deliver(self, user_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(_put_latest, queue, event)
+
+
+def _put_latest(queue, event):
+    # A client that stopped reading loses its oldest events, not the newest.
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+class RedisBroker(LocalBroker):
+    """Fan events out to every worker through a Redis pub/sub channel.
+
+    Each process runs one listener task on its event loop that relays
+    channel messages to its local subscribers. Requires the ``redis``
+    package and REDIS_URL.
+    """
+
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+        self._client = None
+        self._listener = None
+
+    def subscribe(self, user_id):
+        queue = super().subscribe(user_id)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        return queue
+
+    def publish(self, user_id, event):
+        import redis
+
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.url)
+        self._client.publish(STATUS_CHANNEL, json.dumps({'user_id': user_id, 'event': event}))
+
+    async def _listen(self):
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.url)
+        async with client.pubsub() as pubsub:
+            await pubsub.subscribe(STATUS_CHANNEL)
+            async for message in pubsub.listen():
+                if message['type'] != 'message':
+                    continue
+                payload = json.loads(message['data'])
+                self.deliver(payload['user_id'], payload['event'])
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        if settings.COMPLAINT_EVENTS_BACKEND == 'redis':
+            _broker = RedisBroker(settings.REDIS_URL)
+        else:
+            _broker = LocalBroker()
+    return _broker
+
+
+def publish_status_change(complaint, old_status):
+    """Tell the complaint owner's open dashboards that its status changed.
+
+    Published once the surrounding transaction commits, so a client that
+    reloads on the event sees the new status.
+    """
+    event = {
+        'complaint_id': complaint.pk,
+        'title': complaint.title,
+        'old_status': old_status,
+        'status': complaint.status,
+        'status_display': complaint.get_status_display(),
+        'updated_at': complaint.updated_at.isoformat(),
+    }
+    user_id = complaint.user_id
+
+    def publish():
+        # The status change is already committed; a broker outage only
+        # costs the live update, never the admin's request.
+        try:
+            get_broker().publish(user_id, event)
+        except Exception:
+            logger.exception('Could not publish status change of complaint %s', complaint.pk)
+
+    transaction.on_commit(publish)
+
+
+def format_sse(data, event=None, event_id=None):
+    """Encode one server-sent event."""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    if event:
+        lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
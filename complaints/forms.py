@@ -1,7 +1,8 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
-from .models import Complaint, ElectricityBill, Message
+from .models import ArchivedElectricityBill, Complaint, ElectricityBill, Message
+from .segments import SEGMENT_CHOICES
 
 
 class RegistrationForm(UserCreationForm):
@@ -51,7 +52,17 @@ class ComplaintUpdateForm(forms.ModelForm):
         }
 
 
-class ElectricityBillForm(forms.ModelForm):
+class ArchivedBillNumberMixin:
+    """Also reject bill numbers already used by an archived bill."""
+    
+    def validate_unique(self):
+        super().validate_unique()
+        bill_number = self.cleaned_data.get('bill_number')
+        if bill_number and ArchivedElectricityBill.objects.filter(bill_number=bill_number).exists():
+            self.add_error('bill_number', 'An archived bill already has this bill number.')
+
+
+class ElectricityBillForm(ArchivedBillNumberMixin, forms.ModelForm):
     class Meta:
         model = ElectricityBill
         fields = ['bill_number', 'consumer_name', 'address', 'amount', 'due_date']
@@ -64,7 +75,17 @@ class ElectricityBillForm(forms.ModelForm):
         }
 
 
-class ElectricityBillUpdateForm(forms.ModelForm):
+class ElectricityBillImportForm(ElectricityBillForm):
+    """ElectricityBillForm rules for one CSV row of ``manage.py import_bills``."""
+    
+    def validate_unique(self):
+        # Existing bill numbers are updated in place by the importer's
+        # upsert and archived ones are rejected a batch at a time, so
+        # skipping the checks saves queries per row.
+        pass
+
+
+class ElectricityBillUpdateForm(ArchivedBillNumberMixin, forms.ModelForm):
     class Meta:
         model = ElectricityBill
         fields = ['bill_number', 'consumer_name', 'address', 'amount', 'due_date', 'status']
@@ -79,17 +100,42 @@ class ElectricityBillUpdateForm(forms.ModelForm):
 
 
 class MessageForm(forms.ModelForm):
+    # Typed as a username and looked up on submit, so rendering the form
+    # never loads the user table into a <select>.
+    recipient = forms.ModelChoiceField(
+        queryset=User.objects.filter(is_staff=False),
+        to_field_name='username',
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'list': 'recipient-options',
+            'autocomplete': 'off',
+            'placeholder': 'Start typing a username or email',
+        }),
+        error_messages={'invalid_choice': 'No citizen with that username.'},
+    )
+    
     class Meta:
         model = Message
         fields = ['recipient', 'subject', 'content', 'priority']
         widgets = {
-            'recipient': forms.Select(attrs={'class': 'form-control'}),
             'subject': forms.TextInput(attrs={'class': 'form-control'}),
             'content': forms.Textarea(attrs={'class': 'form-control', 'rows': 5}),
             'priority': forms.Select(attrs={'class': 'form-control'}),
         }
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # Only show regular users (non-staff) as recipients
-        self.fields['recipient'].queryset = User.objects.filter(is_staff=False)
+
+
+class BroadcastMessageForm(forms.Form):
+    segment = forms.ChoiceField(choices=SEGMENT_CHOICES, widget=forms.Select(attrs={'class': 'form-control'}))
+    category = forms.ChoiceField(
+        choices=[('', 'Any category')] + Complaint.CATEGORY_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-control'}),
+        help_text='Only used for the open complaints segment.',
+    )
+    subject = forms.CharField(max_length=200, widget=forms.TextInput(attrs={'class': 'form-control'}))
+    priority = forms.ChoiceField(
+        choices=Message.PRIORITY_CHOICES,
+        initial='Medium',
+        widget=forms.Select(attrs={'class': 'form-control'}),
+    )
+    content = forms.CharField(widget=forms.Textarea(attrs={'class': 'form-control', 'rows': 5}))
@@ -0,0 +1,56 @@
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Process-wide fragment cache counters, reported by RequestTimingMiddleware
+FRAGMENT_STATS = Counter()
+
+
+def _version_key(user_id):
+    return f'dashboard:version:{user_id}'
+
+
+async def adashboard_version(user_id):
+    """Current version of a user's dashboard fragment.
+
+    A missing version starts from the clock rather than 1, so a fragment
+    cached under an evicted version can never be served again.
+    """
+    key = _version_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_dashboard_version(user_id):
+    """Invalidate every cached fragment of a user's dashboard."""
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), time.time_ns(), None)
+
+
+async def acached_fragment(request, key, arender):
+    """Return cached HTML for ``key``, awaiting ``arender()`` to fill a miss.
+
+    Hits and misses are counted on the request and process-wide.
+    """
+    html = await cache.aget(key)
+    if html is None:
+        html = await arender()
+        await cache.aset(key, html, settings.FRAGMENT_CACHE_SECONDS)
+        _count(request, 'misses')
+    else:
+        _count(request, 'hits')
+    return html
+
+
+def _count(request, outcome):
+    FRAGMENT_STATS[outcome] += 1
+    request_stats = getattr(request, 'fragment_cache', None)
+    if request_stats is not None:
+        request_stats[outcome] += 1
@@ -0,0 +1,19 @@
+from pathlib import PurePosixPath
+
+# Source image (path under a static dir) -> its pixel size and the widths of
+# the resized variants generated by `build_image_variants`.
+RESPONSIVE_IMAGES = {
+    'img/city-bg.jpg': {'size': (1408, 736), 'widths': (480, 960, 1408)},
+}
+
+# Most preferred first; browsers take the first <source> type they support
+# and the last format is the plain <img> fallback.
+VARIANT_FORMATS = ('avif', 'webp', 'jpg')
+
+CONTENT_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpg': 'image/jpeg'}
+
+
+def variant_name(source, width, image_format):
+    """Static path of one resized variant, e.g. ``img/city-bg-480w.webp``."""
+    path = PurePosixPath(source)
+    return str(path.with_name(f'{path.stem}-{width}w.{image_format}'))
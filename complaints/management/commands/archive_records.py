@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from complaints.archive import ARCHIVES, archivable, archive_batch
+
+
+class Command(BaseCommand):
+    help = 'Move long-resolved complaints and long-cleared bills into the archive tables, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ARCHIVE_AFTER_DAYS,
+                            help='Archive rows resolved/cleared (last updated) more than this many days ago')
+        parser.add_argument('--batch-size', type=int, default=settings.ARCHIVE_BATCH_SIZE,
+                            help='Rows moved per transaction')
+        parser.add_argument('--max-batches', type=int,
+                            help='Stop after this many batches per table; the next run resumes')
+        parser.add_argument('--only', choices=sorted(ARCHIVES), help='Archive just one table')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the rows that would move')
+
+    def handle(self, *args, **options):
+        names = [options['only']] if options['only'] else list(ARCHIVES)
+        for name in names:
+            model, _, status = ARCHIVES[name]
+            if options['dry_run']:
+                count = archivable(model, status, options['days']).count()
+                self.stdout.write(f'{name}: {count} row(s) to archive')
+                continue
+            # Each batch commits on its own, so stopping at any point (or
+            # --max-batches) loses nothing and a rerun simply continues.
+            moved = batches = 0
+            while options['max_batches'] is None or batches < options['max_batches']:
+                count = archive_batch(name, options['days'], options['batch_size'])
+                moved += count
+                batches += 1
+                if count:
+                    self.stdout.write(f'{name}: archived {moved} so far')
+                if count < options['batch_size']:
+                    break
+            self.stdout.write(self.style.SUCCESS(f'{name}: archived {moved} row(s)'))
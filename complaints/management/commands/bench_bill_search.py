@@ -0,0 +1,92 @@
+import random
+import statistics
+import time
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from complaints.models import ElectricityBill
+from complaints.search import search_bills
+
+NAMES = ['Asha', 'Ravi', 'Meera', 'Arjun', 'Kavya', 'Vikram', 'Priya', 'Rahul', 'Divya', 'Suresh']
+SURNAMES = ['Sharma', 'Iyer', 'Reddy', 'Nair', 'Patel', 'Gupta', 'Rao', 'Das', 'Khan', 'Singh']
+OWNER_USERNAME = 'bench-owner'
+
+
+class Command(BaseCommand):
+    help = 'Seed synthetic bills into a throwaway test database and time exact/substring bill search'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000,
+                            help='Total number of BENCH- bills to have in the table')
+        parser.add_argument('--queries', type=int, default=50,
+                            help='Queries timed per search type')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--keep', action='store_true',
+                            help='Seed into the configured database and leave the bills there for the next '
+                                 'run, instead of a throwaway test database (remove them with --flush)')
+        parser.add_argument('--flush', action='store_true',
+                            help='Delete the bills and owner left in the configured database by --keep, then exit')
+
+    def handle(self, *args, **options):
+        if options['flush']:
+            # The bills go with their owner (no delete signals, so one DELETE each)
+            deleted, _ = User.objects.filter(username=OWNER_USERNAME).delete()
+            self.stdout.write(f'Deleted {deleted} rows')
+            return
+        if options['keep']:
+            self.benchmark(options)
+            return
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            self.benchmark(options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    def benchmark(self, options):
+        rng = random.Random(options['seed'])
+        self.seed_bills(options['rows'], rng)
+
+        cases = {
+            'exact bill number': lambda: f"BENCH-{rng.randrange(options['rows']):08d}",
+            'bill number substring': lambda: f"{rng.randrange(10_000):04d}",
+            'consumer name substring': lambda: rng.choice(SURNAMES)[1:5].lower(),
+        }
+        self.stdout.write(f'{connection.vendor}, {ElectricityBill.objects.count()} bills')
+        for label, make_query in cases.items():
+            timings = []
+            for _ in range(options['queries']):
+                query = make_query()
+                start = time.perf_counter()
+                list(search_bills(ElectricityBill.objects.all(), query)[:50])
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            self.stdout.write(
+                f'{label:<25} p50 {statistics.median(timings):8.2f} ms   p95 {p95:8.2f} ms'
+            )
+
+    def seed_bills(self, rows, rng, batch_size=5000):
+        existing = ElectricityBill.objects.filter(bill_number__startswith='BENCH-').count()
+        if existing >= rows:
+            return
+        owner, _ = User.objects.get_or_create(username=OWNER_USERNAME, defaults={'is_active': False})
+        self.stdout.write(f'Seeding {rows - existing} bills...')
+        for start in range(existing, rows, batch_size):
+            ElectricityBill.objects.bulk_create([
+                ElectricityBill(
+                    user=owner,
+                    bill_number=f'BENCH-{n:08d}',
+                    consumer_name=f'{rng.choice(NAMES)} {rng.choice(SURNAMES)}',
+                    address='Synthetic address',
+                    amount=rng.randrange(100, 500_000) / 100,
+                    due_date=date(2026, 1 + n % 12, 1 + n % 28),
+                    status='Due' if n % 3 else 'Cleared',
+                )
+                for n in range(start, min(start + batch_size, rows))
+            ])
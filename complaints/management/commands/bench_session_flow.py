@@ -0,0 +1,71 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from complaints.benchmarks import ISOLATED_CACHES
+
+CONFIGURATIONS = {
+    'db sessions + session messages': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.session.SessionStorage',
+    },
+    'cached_db sessions + cookie messages': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.cookie.CookieStorage',
+    },
+}
+
+PASSWORD = 'bench-pass-12345'
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Count DB round trips for login -> dashboard -> add complaint per session setup'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Dashboard views per run, to show steady-state cost')
+
+    def handle(self, *args, **options):
+        for label, overrides in CONFIGURATIONS.items():
+            with override_settings(ALLOWED_HOSTS=['*'], CACHES=ISOLATED_CACHES, **overrides):
+                cache.clear()
+                steps = self.run_flow(options['repeat'])
+            total = sum(count for _, count in steps)
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{label}: {total} queries'))
+            for step, count in steps:
+                self.stdout.write(f'  {step:<28} {count:3d}')
+
+    def run_flow(self, repeat):
+        """Run the flow inside a transaction that is always rolled back."""
+        steps = []
+        try:
+            with transaction.atomic():
+                User.objects.create_user('bench-citizen', 'bench@example.com', PASSWORD)
+                client = Client()
+
+                def step(name, method, url, data=None):
+                    with CaptureQueriesContext(connection) as queries:
+                        getattr(client, method)(url, data or {})
+                    steps.append((name, len(queries)))
+
+                step('GET login', 'get', reverse('login'))
+                step('POST login', 'post', reverse('login'),
+                     {'username': 'bench-citizen', 'password': PASSWORD})
+                for i in range(repeat):
+                    step(f'GET dashboard #{i + 1}', 'get', reverse('citizen_dashboard'))
+                step('GET add_complaint', 'get', reverse('add_complaint'))
+                step('POST add_complaint', 'post', reverse('add_complaint'),
+                     {'title': 'Bench', 'description': 'Bench complaint', 'category': 'Roads'})
+                step('GET dashboard (after add)', 'get', reverse('citizen_dashboard'))
+                raise Rollback
+        except Rollback:
+            pass
+        return steps
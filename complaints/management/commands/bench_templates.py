@@ -0,0 +1,134 @@
+import itertools
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.forms import AuthenticationForm
+from django.contrib.auth.models import User
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.template.loader import get_template, render_to_string
+from django.test import RequestFactory
+from django.utils import timezone
+
+from complaints.forms import (
+    BroadcastMessageForm, ComplaintForm, ComplaintUpdateForm, ElectricityBillForm,
+    ElectricityBillUpdateForm, MessageForm, RegistrationForm,
+)
+from complaints.models import Complaint, ElectricityBill, Message
+from complaints.pagination import KeysetPage
+from complaints.rendering import project_templates
+
+# Template -> the form its view renders it with
+FORMS = {
+    'register.html': lambda context: RegistrationForm(),
+    'login.html': lambda context: AuthenticationForm(),
+    'add_complaint.html': lambda context: ComplaintForm(),
+    'edit_complaint.html': lambda context: ComplaintForm(instance=context['complaint']),
+    'admin_edit_complaint.html': lambda context: ComplaintUpdateForm(instance=context['complaint']),
+    'add_electricity_bill.html': lambda context: ElectricityBillForm(),
+    'edit_electricity_bill.html': lambda context: ElectricityBillForm(instance=context['bill']),
+    'admin_edit_electricity_bill.html': lambda context: ElectricityBillUpdateForm(instance=context['bill']),
+    'send_message.html': lambda context: MessageForm(),
+    'broadcast_message.html': lambda context: BroadcastMessageForm(),
+}
+
+
+def synthetic_context(rows):
+    """Unsaved model instances shaped like what the views pass to templates."""
+    now = timezone.now()
+    citizen = User(pk=1, username='citizen', first_name='Asha', last_name='Rao', email='citizen@example.com')
+    admin = User(pk=2, username='admin', first_name='City', last_name='Admin', is_staff=True)
+    statuses = itertools.cycle(value for value, _ in Complaint.STATUS_CHOICES)
+    categories = itertools.cycle(value for value, _ in Complaint.CATEGORY_CHOICES)
+    bill_statuses = itertools.cycle(value for value, _ in ElectricityBill.STATUS_CHOICES)
+    priorities = itertools.cycle(value for value, _ in Message.PRIORITY_CHOICES)
+    complaints = [
+        Complaint(pk=i, user=citizen, title=f'Complaint {i}', description='Water leaking onto the road ' * 4,
+                  category=next(categories), status=next(statuses), created_at=now, updated_at=now)
+        for i in range(1, rows + 1)
+    ]
+    bills = [
+        ElectricityBill(pk=i, user=citizen, bill_number=f'EB-{i:06d}', consumer_name='Asha Rao',
+                        address='12 Market Road', amount=Decimal('1234.50'), due_date=now.date() + timedelta(days=i),
+                        status=next(bill_statuses), created_at=now, updated_at=now)
+        for i in range(1, rows + 1)
+    ]
+    inbox = [
+        Message(pk=i, sender=admin, recipient=citizen, subject=f'Notice {i}', content='Scheduled maintenance. ' * 5,
+                priority=next(priorities), is_read=bool(i % 2), created_at=now, read_at=now if i % 2 else None)
+        for i in range(1, rows + 1)
+    ]
+    page = KeysetPage(complaints, next_cursor='bench', is_first=False)
+    context = {
+        'complaints': complaints,
+        'complaint': complaints[0],
+        'bills': bills,
+        'bill': bills[0],
+        'inbox': inbox,
+        'sent_messages': inbox,
+        'message': inbox[0],
+        'page': page,
+        'next_query': 'cursor=bench',
+        'first_query': '',
+        'counts': {'pending': rows // 3, 'in_progress': rows // 3, 'resolved': rows // 3},
+        'totals': {'total': rows, 'due': rows // 2, 'cleared': rows // 2, 'total_amount': Decimal('1000'),
+                   'due_amount': Decimal('500'), 'cleared_amount': Decimal('500')},
+        'status_choices': Complaint.STATUS_CHOICES,
+        'category_choices': Complaint.CATEGORY_CHOICES,
+        'search_query': '',
+        'status_filter': '',
+        'category_filter': '',
+    }
+    context['complaints_html'] = render_to_string('includes/citizen_complaints.html', context)
+    return context, admin
+
+
+class Command(BaseCommand):
+    help = 'Render every project template with synthetic data and report microseconds per render'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--rows', type=int, default=25, help='Rows in each synthetic list')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        base_context, user = synthetic_context(options['rows'])
+        engine = engines['django'].engine
+        request = RequestFactory().get('/')
+        request.user = user
+        request.unread_message_count = 3
+        request._messages = CookieStorage(request)
+
+        results = []
+        for name in project_templates():
+            context = dict(base_context)
+            if name in FORMS:
+                context['form'] = FORMS[name](context)
+            template = get_template(name)
+            source = template.template.source
+            try:
+                template.render(context, request)
+            except Exception as exc:
+                self.stderr.write(f'{name}: {exc.__class__.__name__}: {exc}')
+                continue
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                engine.from_string(source)
+            parse_us = (time.perf_counter() - start) / iterations * 1e6
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                template.render(context, request)
+            render_us = (time.perf_counter() - start) / iterations * 1e6
+            results.append((name, parse_us, render_us))
+
+        self.stdout.write(f'{"template":<40} {"parse µs":>10} {"render µs":>10}')
+        for name, parse_us, render_us in sorted(results, key=lambda row: -row[2]):
+            self.stdout.write(f'{name:<40} {parse_us:>10.1f} {render_us:>10.1f}')
+        self.stdout.write(
+            f'{len(results)} templates, {options["rows"]} rows per list, {iterations} iterations. '
+            '"parse" is the cost the cached loader saves on every render after the first.'
+        )
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from complaints.benchmarks import (
+    CACHED_SESSIONS, DEFAULT_THRESHOLD, ISOLATED_CACHES, load_baseline, measure, query_regressions, slowdowns,
+    url_cases, write_baseline,
+)
+from complaints.seeding import USERNAME_PREFIX, seed_city
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json'
+
+
+class Command(BaseCommand):
+    help = ('Seed a throwaway test database, GET every complaints URL through the test client and '
+            'compare latency and query counts with a JSON baseline')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+        parser.add_argument('--update', action='store_true', help='Write the results as the new baseline')
+        parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                            help=f'Allowed median slowdown as a fraction (default: {DEFAULT_THRESHOLD})')
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per URL')
+        parser.add_argument('--retries', type=int, default=2,
+                            help='Times a slow URL is measured again before it counts as a regression')
+        parser.add_argument('--users', type=int, default=500, help='Citizens in the seeded city')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        run_settings = {'users': options['users'], 'seed': options['seed'], 'iterations': options['iterations']}
+        baseline = None
+        if not options['update']:
+            try:
+                baseline = load_baseline(options['baseline'])
+            except FileNotFoundError:
+                raise CommandError(f'No baseline at {options["baseline"]}; run with --update to record one')
+            if baseline['settings'] != run_settings:
+                raise CommandError(f'Baseline was recorded with {baseline["settings"]}; '
+                                   'rerun with those options or --update')
+        previous = baseline['urls'] if baseline else {}
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with override_settings(CACHES=ISOLATED_CACHES, SESSION_ENGINE=CACHED_SESSIONS):
+                cache.clear()
+                seed_city(users=options['users'], seed=options['seed'])
+                citizen = User.objects.get(username=f'{USERNAME_PREFIX}citizen-000000')
+                admin = User.objects.get(username=f'{USERNAME_PREFIX}admin')
+                cases = url_cases(citizen, admin)
+                try:
+                    results = measure(cases, options['iterations'])
+                    # A slow median is only a regression if it repeats;
+                    # a single run can land on a busy moment.
+                    slow = slowdowns(previous, results, options['threshold'])
+                    for _ in range(options['retries']):
+                        if not slow:
+                            break
+                        again = measure({name: cases[name] for name in slow}, options['iterations'])
+                        slow = slowdowns(previous, again, options['threshold'])
+                except ValueError as exc:
+                    raise CommandError(str(exc))
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f'{"url name":<32} {"median ms":>10} {"p95 ms":>10} {"queries":>8} {"baseline":>10}')
+        for name, result in results.items():
+            base = previous.get(name)
+            reference = f'{base["median_ms"]:>10.2f}' if base else f'{"-":>10}'
+            self.stdout.write(f'{name:<32} {result["median_ms"]:>10.2f} {result["p95_ms"]:>10.2f} '
+                              f'{result["queries"]:>8} {reference}')
+
+        if options['update']:
+            write_baseline(options['baseline'], run_settings, results)
+            self.stdout.write(self.style.SUCCESS(f'Wrote {options["baseline"]}'))
+            return
+        regressions = query_regressions(previous, results) + list(slow.values())
+        if regressions:
+            raise CommandError('Performance regressions:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS(f'{len(results)} URLs within the baseline'))
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+
+from complaints.images import RESPONSIVE_IMAGES, VARIANT_FORMATS, variant_name
+
+SAVE_OPTIONS = {
+    'avif': {'format': 'AVIF', 'quality': 50},
+    'webp': {'format': 'WEBP', 'quality': 75, 'method': 6},
+    'jpg': {'format': 'JPEG', 'quality': 78, 'optimize': True, 'progressive': True},
+}
+
+
+class Command(BaseCommand):
+    help = 'Generate resized AVIF/WebP/JPEG variants of the responsive images (run before collectstatic)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Rebuild variants that are up to date')
+
+    def handle(self, *args, **options):
+        try:
+            from PIL import Image
+        except ImportError:
+            raise CommandError('Pillow is required to build image variants')
+
+        for source, spec in RESPONSIVE_IMAGES.items():
+            path = finders.find(source)
+            if path is None:
+                raise CommandError(f'Static file not found: {source}')
+            path = Path(path)
+            with Image.open(path) as original:
+                original = original.convert('RGB')
+                if original.size != tuple(spec['size']):
+                    raise CommandError(
+                        f"{source} is {original.size[0]}x{original.size[1]}, "
+                        f"update its size in complaints/images.py"
+                    )
+                self.stdout.write(f'{source}: {path.stat().st_size // 1024} KB')
+                for width in spec['widths']:
+                    height = round(original.height * width / original.width)
+                    resized = None
+                    for image_format in VARIANT_FORMATS:
+                        # Variants sit next to their source in the same static dir
+                        target = path.parent / Path(variant_name(source, width, image_format)).name
+                        if (not options['force'] and target.exists()
+                                and target.stat().st_mtime >= path.stat().st_mtime):
+                            continue
+                        if resized is None:
+                            resized = original.resize((width, height), Image.Resampling.LANCZOS)
+                        resized.save(target, **SAVE_OPTIONS[image_format])
+                        self.stdout.write(f'  {target.name}: {target.stat().st_size // 1024} KB')
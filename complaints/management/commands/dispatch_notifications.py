@@ -0,0 +1,29 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from complaints.notifications import dispatch_batch
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued email notifications from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.NOTIFICATION_BATCH_SIZE,
+                            help='Number of notifications sent per SMTP connection')
+        parser.add_argument('--interval', type=float, default=settings.NOTIFICATION_POLL_SECONDS,
+                            help='Seconds to sleep when the outbox is empty')
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the outbox once and exit instead of polling')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        while True:
+            sent, failed = dispatch_batch(batch_size)
+            if sent or failed:
+                self.stdout.write(f'Sent {sent} notification(s), {failed} failed')
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
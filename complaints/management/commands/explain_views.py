@@ -0,0 +1,70 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from complaints.benchmarks import CACHED_SESSIONS, ISOLATED_CACHES, url_cases
+from complaints.queryplans import EXPECTED, explain, plan_problems, view_queries
+from complaints.seeding import USERNAME_PREFIX, seed_city
+
+
+class Command(BaseCommand):
+    help = ('Seed a throwaway test database, capture the SQL every complaints view runs and '
+            'EXPLAIN it, flagging sequential scans and unindexed sorts')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=2000, help='Citizens in the seeded city')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--url', action='append', dest='urls', help='Only this url name (repeatable)')
+        parser.add_argument('--plans', action='store_true',
+                            help='Print every plan, including clean and expected ones')
+        parser.add_argument('--fail', action='store_true', help='Exit with an error if anything is flagged')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with override_settings(CACHES=ISOLATED_CACHES, SESSION_ENGINE=CACHED_SESSIONS):
+                cache.clear()
+                seed_city(users=options['users'], seed=options['seed'])
+                with connection.cursor() as cursor:
+                    # Give the planner row counts to work with, as production has
+                    cursor.execute('ANALYZE')
+                citizen = User.objects.get(username=f'{USERNAME_PREFIX}citizen-000000')
+                admin = User.objects.get(username=f'{USERNAME_PREFIX}admin')
+                cases = url_cases(citizen, admin)
+                if options['urls']:
+                    unknown = set(options['urls']) - set(cases)
+                    if unknown:
+                        raise CommandError(f'Unknown url names: {", ".join(sorted(unknown))}')
+                    cases = {name: cases[name] for name in options['urls']}
+                flagged = self.report(view_queries(cases), options['plans'])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        if flagged and options['fail']:
+            raise CommandError(f'{flagged} queries scan or sort without an index')
+        self.stdout.write(f'{flagged} flagged queries')
+
+    def report(self, statements, show_all):
+        flagged = 0
+        for name, queries in statements.items():
+            for sql in queries:
+                plan = explain(sql)
+                problems = plan_problems(plan)
+                unexpected = set(problems) - EXPECTED.get(name, set())
+                if not unexpected and not show_all:
+                    continue
+                flagged += bool(unexpected)
+                if unexpected:
+                    label = self.style.WARNING(', '.join(problems))
+                else:
+                    label = ', '.join(problems) + ' (expected)' if problems else 'ok'
+                self.stdout.write(f'{name}: {label}')
+                self.stdout.write(f'  {sql}')
+                for line in plan:
+                    self.stdout.write(f'    {line}')
+        return flagged
@@ -0,0 +1,97 @@
+import csv
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from complaints.forms import ElectricityBillImportForm
+from complaints.models import ArchivedElectricityBill, ElectricityBill
+
+UPDATE_FIELDS = ['consumer_name', 'address', 'amount', 'due_date', 'updated_at']
+MAX_REPORTED_ERRORS = 20
+
+
+class Command(BaseCommand):
+    help = 'Stream electricity bills from a CSV file into the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', help='CSV with bill_number, consumer_name, address, amount, due_date columns')
+        parser.add_argument('--owner', required=True, help='Username the imported bills are filed under')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        try:
+            owner = User.objects.get(username=options['owner'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['owner']}' does not exist")
+
+        batch_size = options['batch_size']
+        batch = []
+        imported = invalid = 0
+        start = time.perf_counter()
+
+        with open(options['csv_path'], newline='', encoding='utf-8-sig') as handle:
+            reader = csv.DictReader(handle)
+            missing = set(ElectricityBillImportForm.Meta.fields) - set(reader.fieldnames or [])
+            if missing:
+                raise CommandError(f"CSV is missing column(s): {', '.join(sorted(missing))}")
+
+            for line_number, row in enumerate(reader, start=2):
+                form = ElectricityBillImportForm(row)
+                if not form.is_valid():
+                    invalid += 1
+                    if invalid <= MAX_REPORTED_ERRORS:
+                        self.stderr.write(f'Line {line_number}: {form.errors.as_text()}')
+                    continue
+                bill = form.save(commit=False)
+                bill.user = owner
+                batch.append((line_number, bill))
+                if len(batch) >= batch_size:
+                    written, archived = self.write_batch(batch)
+                    imported += written
+                    invalid += archived
+                    batch = []
+                    self.report(imported, start)
+            if batch:
+                written, archived = self.write_batch(batch)
+                imported += written
+                invalid += archived
+
+        elapsed = time.perf_counter() - start
+        rate = imported / elapsed if elapsed else imported
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} bill(s), skipped {invalid} invalid row(s) '
+            f'in {elapsed:.1f}s ({rate:,.0f} rows/s)'
+        ))
+
+    def write_batch(self, batch):
+        """Upsert (line number, bill) pairs; return (written, archived) counts.
+
+        Bill numbers that belong to an archived bill are skipped, since the
+        upsert only sees the live table.
+        """
+        archived = set(ArchivedElectricityBill.objects.filter(
+            bill_number__in=[bill.bill_number for _, bill in batch],
+        ).values_list('bill_number', flat=True))
+        for line_number, bill in batch:
+            if bill.bill_number in archived:
+                self.stderr.write(f'Line {line_number}: bill number {bill.bill_number} belongs to an archived bill')
+        # bulk_create sends no post_save signals, so no notifications go out.
+        # Bill numbers repeated within a batch would make PostgreSQL reject
+        # the upsert, so the last occurrence wins.
+        unique = list({
+            bill.bill_number: bill for _, bill in batch if bill.bill_number not in archived
+        }.values())
+        with transaction.atomic():
+            ElectricityBill.objects.bulk_create(
+                unique,
+                update_conflicts=True,
+                unique_fields=['bill_number'],
+                update_fields=UPDATE_FIELDS,
+            )
+        return len(unique), sum(bill.bill_number in archived for _, bill in batch)
+
+    def report(self, imported, start):
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f'  {imported} rows ({imported / elapsed:,.0f} rows/s)')
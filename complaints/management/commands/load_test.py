@@ -0,0 +1,94 @@
+import http.cookiejar
+import statistics
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from complaints.perf import percentile
+
+DEFAULT_PATHS = ['/citizen-dashboard/', '/electricity-bills/', '/messages/']
+
+
+def rss_kib(pid):
+    """Resident set size of a process in KiB, read from /proc (Linux only)."""
+    try:
+        status = Path(f'/proc/{pid}/status').read_text()
+    except OSError:
+        return 0
+    for line in status.splitlines():
+        if line.startswith('VmRSS:'):
+            return int(line.split()[1])
+    return 0
+
+
+class Command(BaseCommand):
+    help = 'Drive concurrent GETs at a running server and report throughput and latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('base_url', help='Server to load, e.g. http://127.0.0.1:8000')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help=f'Path to request (repeatable, default: {" ".join(DEFAULT_PATHS)})')
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--requests', type=int, default=1000, help='Total requests to send')
+        parser.add_argument('--username', help='Log in as this user before the run')
+        parser.add_argument('--password')
+        parser.add_argument('--pid', type=int, action='append', dest='pids', default=[],
+                            help='Server process to include in the RSS total (repeatable)')
+
+    def handle(self, *args, **options):
+        base_url = options['base_url'].rstrip('/')
+        paths = options['paths'] or DEFAULT_PATHS
+        cookies = http.cookiejar.CookieJar()
+        if options['username']:
+            self.login(base_url, cookies, options['username'], options['password'] or '')
+
+        def fetch(i):
+            opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(cookies))
+            url = base_url + paths[i % len(paths)]
+            start = time.perf_counter()
+            try:
+                with opener.open(url, timeout=30) as response:
+                    response.read()
+                    ok = response.status == 200
+            except (urllib.error.URLError, OSError):
+                ok = False
+            return time.perf_counter() - start, ok
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            results = list(pool.map(fetch, range(options['requests'])))
+        elapsed = time.perf_counter() - started
+
+        latencies = [seconds * 1000 for seconds, _ in results]
+        errors = sum(1 for _, ok in results if not ok)
+        self.stdout.write(f'requests     {len(results)} ({errors} errors)')
+        self.stdout.write(f'concurrency  {options["concurrency"]}')
+        self.stdout.write(f'throughput   {len(results) / elapsed:.1f} req/s')
+        self.stdout.write(f'latency mean {statistics.mean(latencies):.1f}ms')
+        for pct in (50, 95, 99):
+            self.stdout.write(f'latency p{pct:<3} {percentile(latencies, pct):.1f}ms')
+        if options['pids']:
+            total = sum(rss_kib(pid) for pid in options['pids'])
+            self.stdout.write(f'server RSS   {total / 1024:.1f} MiB over {len(options["pids"])} processes')
+
+    def login(self, base_url, cookies, username, password):
+        opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(cookies))
+        login_url = f'{base_url}/login/'
+        opener.open(login_url, timeout=30).read()
+        token = next((cookie.value for cookie in cookies if cookie.name == 'csrftoken'), None)
+        if token is None:
+            raise CommandError('Login page did not set a CSRF cookie')
+        data = urllib.parse.urlencode({
+            'username': username,
+            'password': password,
+            'csrfmiddlewaretoken': token,
+        }).encode()
+        request = urllib.request.Request(login_url, data=data, headers={'Referer': login_url})
+        opener.open(request, timeout=30).read()
+        if not any(cookie.name == 'sessionid' for cookie in cookies):
+            raise CommandError(f'Could not log in as {username}')
@@ -0,0 +1,78 @@
+import json
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from complaints.perf import TIMINGS, percentile
+
+METRICS = ['total_ms', 'db_queries'] + [f'{kind}_ms' for kind in TIMINGS]
+
+
+def read_records(lines):
+    """Request records from perf log lines, skipping anything that isn't one.
+
+    Lines may carry a prefix from the log shipper (timestamp, level), so
+    parsing starts at the first brace.
+    """
+    for line in lines:
+        start = line.find('{')
+        if start == -1:
+            continue
+        try:
+            record = json.loads(line[start:])
+        except ValueError:
+            continue
+        if isinstance(record, dict) and record.get('event') == 'request':
+            yield record
+
+
+class Command(BaseCommand):
+    help = 'Summarise request metrics from the perf log: p50/p95/p99 per URL name'
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='*',
+                            help='Log files to read ("-" for stdin, default: PERF_LOG_FILE)')
+        parser.add_argument('--metric', choices=METRICS, default='total_ms',
+                            help='Field to take percentiles of (default: total_ms)')
+        parser.add_argument('--min-count', type=int, default=1,
+                            help='Leave out URL names with fewer requests than this')
+
+    def handle(self, *args, **options):
+        files = options['files'] or ([settings.PERF_LOG_FILE] if settings.PERF_LOG_FILE else [])
+        if not files:
+            raise CommandError('No log files given and PERF_LOG_FILE is not set')
+        metric = options['metric']
+
+        samples = defaultdict(list)
+        db_queries = defaultdict(list)
+        for name in files:
+            if name == '-':
+                records = read_records(sys.stdin)
+            else:
+                try:
+                    handle = open(name, encoding='utf-8')
+                except OSError as exc:
+                    raise CommandError(f'Cannot read {name}: {exc}')
+                with handle:
+                    records = list(read_records(handle))
+            for record in records:
+                url_name = record.get('url_name') or '(unresolved)'
+                samples[url_name].append(record.get(metric, 0))
+                db_queries[url_name].append(record.get('db_queries', 0))
+
+        rows = [(url_name, values) for url_name, values in samples.items() if len(values) >= options['min_count']]
+        if not rows:
+            self.stdout.write('No request records found.')
+            return
+
+        self.stdout.write(f'{"url name":<32} {"count":>7} {"p50":>9} {"p95":>9} {"p99":>9} {"queries":>8}')
+        for url_name, values in sorted(rows, key=lambda row: -percentile(row[1], 95)):
+            queries = sum(db_queries[url_name]) / len(values)
+            self.stdout.write(
+                f'{url_name:<32} {len(values):>7} {percentile(values, 50):>9.1f} '
+                f'{percentile(values, 95):>9.1f} {percentile(values, 99):>9.1f} {queries:>8.1f}'
+            )
+        self.stdout.write(f'{sum(len(values) for _, values in rows)} requests; percentiles of {metric}, '
+                          'queries is the mean per request.')
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from complaints.models import Message, UserProfile
+
+
+class Command(BaseCommand):
+    help = 'Recount unread messages per user and repair drifted counters'
+
+    def handle(self, *args, **options):
+        actual = dict(
+            Message.objects.filter(is_read=False)
+            .order_by()
+            .values('recipient')
+            .annotate(count=Count('id'))
+            .values_list('recipient', 'count')
+        )
+        stored = dict(UserProfile.objects.values_list('user_id', 'unread_messages'))
+
+        repaired = 0
+        for user_id in set(actual) | set(stored):
+            count = actual.get(user_id, 0)
+            if stored.get(user_id) != count:
+                UserProfile.objects.update_or_create(user_id=user_id, defaults={'unread_messages': count})
+                repaired += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {len(set(actual) | set(stored))} counter(s), repaired {repaired}'
+        ))
@@ -0,0 +1,50 @@
+import secrets
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from complaints.seeding import USERNAME_PREFIX, flush_city, seed_city, seeded_users
+
+
+class Command(BaseCommand):
+    help = 'Generate a reproducible synthetic city (users, complaints, bills, messages) with bulk_create'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Citizens to create')
+        parser.add_argument('--complaints', type=int, default=5, help='Complaints per citizen')
+        parser.add_argument('--bills', type=int, default=3, help='Bills per citizen')
+        parser.add_argument('--messages', type=int, default=4, help='Messages per citizen')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--flush', action='store_true',
+                            help=f'Delete a previously seeded city ({USERNAME_PREFIX}* accounts) first')
+        parser.add_argument('--password',
+                            help='Password for every generated account (default: a random one, printed)')
+        parser.add_argument('--allow-production', action='store_true',
+                            help='Seed even though DEBUG is off; this creates a staff account')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['allow_production']:
+            raise CommandError(f'DEBUG is off, so this may be a live database. seed_city creates a staff '
+                               f'account ({USERNAME_PREFIX}admin); pass --allow-production if you mean it')
+        password = options['password'] or secrets.token_urlsafe(12)
+        if options['flush']:
+            self.stdout.write(f'Deleted {flush_city()} seeded rows')
+        elif seeded_users().exists():
+            raise CommandError('A seeded city already exists; pass --flush to replace it')
+
+        start = time.perf_counter()
+        counts = seed_city(
+            users=options['users'],
+            complaints=options['complaints'],
+            bills=options['bills'],
+            messages=options['messages'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            password=password,
+        )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(', '.join(f'{count} {model}' for model, count in counts.items()) + f' in {elapsed:.1f}s')
+        self.stdout.write(f'Log in as {USERNAME_PREFIX}admin or {USERNAME_PREFIX}citizen-000000 '
+                          f'with password {password}')
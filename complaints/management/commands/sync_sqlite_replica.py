@@ -0,0 +1,36 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = 'Copy the SQLite database into the SQLite READ_REPLICA_URL file (local stand-in for replication)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--every', type=float,
+                            help='Keep copying every this many seconds, simulating replication lag')
+
+    def handle(self, *args, **options):
+        alias = settings.READ_REPLICA_ALIAS
+        if not alias:
+            raise CommandError('READ_REPLICA_URL is not set')
+        primary, replica = connections[DEFAULT_DB_ALIAS], connections[alias]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError('Both the default database and the replica must be SQLite')
+
+        while True:
+            primary.ensure_connection()
+            target = sqlite3.connect(replica.settings_dict['NAME'])
+            try:
+                # The online backup API copies a consistent snapshot while
+                # the primary stays writable.
+                primary.connection.backup(target)
+            finally:
+                target.close()
+            self.stdout.write(f'Copied {primary.settings_dict["NAME"]} to {replica.settings_dict["NAME"]}')
+            if not options['every']:
+                break
+            time.sleep(options['every'])
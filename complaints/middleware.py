@@ -0,0 +1,147 @@
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import perf
+from .conditional import CONDITIONAL_STATS
+from .fragments import FRAGMENT_STATS
+from .routing import pin_after_write, reset_write_tracking, track_writes
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoise that also runs natively under ASGI.
+
+    Stock WhiteNoiseMiddleware is sync-only, which makes Django hop to a
+    thread for every request and run async views through async_to_sync.
+    Static lookups are in-memory dict hits, so they are safe to do inline.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+
+class RequestTimingMiddleware:
+    """Report where a request's time went, in headers and the perf log.
+
+    Every request is logged as one JSON line on ``complaints.perf`` for
+    ``manage.py perf_report``, with the time spent on the database (and
+    the query count), template rendering and outbound mail, plus its
+    fragment cache hits/misses. ``X-Response-Time`` is this request's
+    duration in milliseconds and ``X-Fragment-Cache`` its fragment cache
+    hits/misses.
+
+    With PERF_HEADERS on (the default under DEBUG), ``Server-Timing``
+    carries the same breakdown as the log line, ``X-Fragment-Cache-Ratio``
+    the hit ratio since the worker started, and ``X-Conditional-Get`` the
+    conditional_page responses this worker answered with 304 Not Modified
+    versus rendered in full. They describe the server rather than the
+    request, so they are not sent to every visitor in production.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        connection_created.connect(perf.install_db_wrapper)
+        for connection in connections.all(initialized_only=True):
+            perf.install_db_wrapper(None, connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            perf.end_request(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            perf.end_request(token)
+        return self.finish(request, response, metrics)
+
+    def start(self, request):
+        request.fragment_cache = Counter()
+        return perf.begin_request()
+
+    def finish(self, request, response, metrics):
+        elapsed_ms = (time.perf_counter() - metrics.started) * 1000
+        response['X-Response-Time'] = f'{elapsed_ms:.1f}ms'
+        perf.log_request(request, response, metrics, elapsed_ms)
+        if request.fragment_cache:
+            response['X-Fragment-Cache'] = (
+                f"hits={request.fragment_cache['hits']}, misses={request.fragment_cache['misses']}"
+            )
+        if not settings.PERF_HEADERS:
+            return response
+        response['Server-Timing'] = perf.server_timing(metrics, elapsed_ms)
+        lookups = FRAGMENT_STATS['hits'] + FRAGMENT_STATS['misses']
+        if lookups:
+            response['X-Fragment-Cache-Ratio'] = f"{FRAGMENT_STATS['hits'] / lookups:.3f}"
+        if CONDITIONAL_STATS:
+            response['X-Conditional-Get'] = (
+                f"not-modified={CONDITIONAL_STATS['not_modified']}, rendered={CONDITIONAL_STATS['rendered']}"
+            )
+        return response
+
+
+class ReplicaPinMiddleware:
+    """Pin a user to the primary database for a while after each write.
+
+    See complaints/routing.py; does nothing unless READ_REPLICA_URL is set.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        writes, token = track_writes()
+        try:
+            return pin_after_write(request, self.get_response(request), writes)
+        finally:
+            reset_write_tracking(token)
+
+    async def __acall__(self, request):
+        writes, token = track_writes()
+        try:
+            return pin_after_write(request, await self.get_response(request), writes)
+        finally:
+            reset_write_tracking(token)
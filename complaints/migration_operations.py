@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+class VendorRunSQL(migrations.RunSQL):
+    """``RunSQL`` that only runs on one database vendor.
+
+    For indexes Django cannot express portably (GIN on PostgreSQL): they
+    stay out of the model state, so a later AlterField that makes SQLite
+    rebuild the table never tries to re-create them.
+    """
+
+    def __init__(self, sql, reverse_sql=None, vendor='postgresql', **kwargs):
+        super().__init__(sql, reverse_sql, **kwargs)
+        self.vendor = vendor
+
+    def deconstruct(self):
+        name, args, kwargs = super().deconstruct()
+        kwargs['vendor'] = self.vendor
+        return name, args, kwargs
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+    def describe(self):
+        return f'{super().describe()} ({self.vendor} only)'
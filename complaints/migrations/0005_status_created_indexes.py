@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0004_notificationoutbox'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['status', 'created_at'], name='complaint_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='electricitybill',
+            index=models.Index(fields=['status', 'created_at'], name='bill_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:09
+
+from django.conf import settings
+from django.db import migrations
+
+import complaints.migration_operations
+
+
+# What Django compiles SearchVector('title', 'description', config='english')
+# to, so full-text queries (complaints/search.py) can use the index.
+POSTGRES_SEARCH_INDEX = (
+    "CREATE INDEX complaint_search_idx ON complaints_complaint USING gin "
+    "((to_tsvector('english'::regconfig, COALESCE(title, '') || ' ' || COALESCE(description, ''))))"
+)
+
+# SQLite has no GIN indexes, so local databases get an external-content
+# FTS5 table over (title, description) kept in sync by triggers.
+SQLITE_FTS_SETUP = [
+    """CREATE VIRTUAL TABLE complaints_complaint_fts USING fts5(
+        title, description, content='complaints_complaint', content_rowid='id'
+    )""",
+    """CREATE TRIGGER complaints_complaint_fts_ai AFTER INSERT ON complaints_complaint BEGIN
+        INSERT INTO complaints_complaint_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER complaints_complaint_fts_ad AFTER DELETE ON complaints_complaint BEGIN
+        INSERT INTO complaints_complaint_fts(complaints_complaint_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER complaints_complaint_fts_au AFTER UPDATE OF title, description ON complaints_complaint BEGIN
+        INSERT INTO complaints_complaint_fts(complaints_complaint_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO complaints_complaint_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+    "INSERT INTO complaints_complaint_fts(complaints_complaint_fts) VALUES ('rebuild')",
+]
+
+SQLITE_FTS_TEARDOWN = [
+    'DROP TRIGGER IF EXISTS complaints_complaint_fts_au',
+    'DROP TRIGGER IF EXISTS complaints_complaint_fts_ad',
+    'DROP TRIGGER IF EXISTS complaints_complaint_fts_ai',
+    'DROP TABLE IF EXISTS complaints_complaint_fts',
+]
+
+
+def create_sqlite_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for statement in SQLITE_FTS_SETUP:
+            schema_editor.execute(statement)
+
+
+def drop_sqlite_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for statement in SQLITE_FTS_TEARDOWN:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0006_userprofile'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Kept out of the model state: SQLite cannot create a GIN index, and
+        # rebuilding the table for any later AlterField would try to.
+        complaints.migration_operations.VendorRunSQL(
+            POSTGRES_SEARCH_INDEX,
+            reverse_sql='DROP INDEX IF EXISTS complaint_search_idx',
+            vendor='postgresql',
+        ),
+        migrations.RunPython(create_sqlite_fts, drop_sqlite_fts),
+    ]
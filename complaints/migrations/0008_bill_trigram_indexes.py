@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:11
+
+import django.contrib.postgres.operations
+from django.conf import settings
+from django.db import migrations
+
+import complaints.migration_operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0007_complaint_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # No-op on SQLite; CREATE EXTENSION IF NOT EXISTS pg_trgm on PostgreSQL.
+        django.contrib.postgres.operations.TrigramExtension(),
+        # Kept out of the model state (see 0007): SQLite cannot create them
+        complaints.migration_operations.VendorRunSQL(
+            'CREATE INDEX bill_number_trgm_idx ON complaints_electricitybill '
+            'USING gin ((UPPER(bill_number)) gin_trgm_ops)',
+            reverse_sql='DROP INDEX IF EXISTS bill_number_trgm_idx',
+            vendor='postgresql',
+        ),
+        complaints.migration_operations.VendorRunSQL(
+            'CREATE INDEX bill_consumer_trgm_idx ON complaints_electricitybill '
+            'USING gin ((UPPER(consumer_name)) gin_trgm_ops)',
+            reverse_sql='DROP INDEX IF EXISTS bill_consumer_trgm_idx',
+            vendor='postgresql',
+        ),
+    ]
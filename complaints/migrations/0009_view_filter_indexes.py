@@ -0,0 +1,99 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def drop_foreign_key_index(table, column, index_name, alter_field):
+    """Record ``db_index=False`` on a foreign key by dropping only its index.
+
+    A plain AlterField makes SQLite rebuild the whole table (and re-create
+    the PostgreSQL-only GIN indexes from the model state, which fails).
+    """
+    return migrations.SeparateDatabaseAndState(
+        state_operations=[alter_field],
+        database_operations=[
+            migrations.RunSQL(
+                f'DROP INDEX IF EXISTS {index_name}',
+                reverse_sql=f'CREATE INDEX {index_name} ON {table} ({column})',
+            ),
+        ],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0008_bill_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    # The composite indexes are built before the single-column foreign key
+    # indexes they make redundant are dropped.
+    operations = [
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['-created_at', '-id'], name='complaint_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='complaint_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['category', '-created_at', '-id'], name='complaint_category_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='electricitybill',
+            index=models.Index(fields=['-created_at', '-id'], name='bill_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='electricitybill',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='bill_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['recipient', '-created_at', '-id'], name='message_recipient_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['sender', '-created_at', '-id'], name='message_sender_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['recipient'], name='message_unread_idx'),
+        ),
+        drop_foreign_key_index(
+            'complaints_complaint', 'user_id', 'complaints_complaint_user_id_fbe61a45',
+            migrations.AlterField(
+                model_name='complaint',
+                name='user',
+                field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='complaints', to=settings.AUTH_USER_MODEL),
+            ),
+        ),
+        drop_foreign_key_index(
+            'complaints_electricitybill', 'user_id', 'complaints_electricitybill_user_id_df3478b3',
+            migrations.AlterField(
+                model_name='electricitybill',
+                name='user',
+                field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='electricity_bills', to=settings.AUTH_USER_MODEL),
+            ),
+        ),
+        drop_foreign_key_index(
+            'complaints_message', 'recipient_id', 'complaints_message_recipient_id_25c0e8ae',
+            migrations.AlterField(
+                model_name='message',
+                name='recipient',
+                field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='received_messages', to=settings.AUTH_USER_MODEL),
+            ),
+        ),
+        drop_foreign_key_index(
+            'complaints_message', 'sender_id', 'complaints_message_sender_id_f9f591f5',
+            migrations.AlterField(
+                model_name='message',
+                name='sender',
+                field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='sent_messages', to=settings.AUTH_USER_MODEL),
+            ),
+        ),
+    ]
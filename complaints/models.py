@@ -1,4 +1,9 @@
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
 from django.db import models
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Greatest
 from django.contrib.auth.models import User
 from django.utils import timezone
 
@@ -18,7 +23,8 @@ class Complaint(models.Model):
         ('Resolved', 'Resolved'),
     ]
     
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='complaints')
+    # Indexed by complaint_user_created_idx
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='complaints', db_index=False)
     title = models.CharField(max_length=200)
     description = models.TextField()
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
@@ -28,9 +34,62 @@ class Complaint(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        # Lists are paged newest first on (-created_at, -id) (see pagination.py),
+        # so each filter the views apply gets an index in that order.
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='complaint_status_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='complaint_created_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='complaint_user_created_idx'),
+            models.Index(fields=['category', '-created_at', '-id'], name='complaint_category_created_idx'),
+        ]
+        # Full-text search uses complaint_search_idx (GIN) on PostgreSQL and
+        # an FTS5 shadow table kept in sync by triggers on SQLite. Both are
+        # created by raw SQL in migration 0007, outside the model state. A
+        # migration that makes SQLite rebuild this table drops the triggers
+        # and must re-create them (ComplaintSearchTests would catch it).
+    
+    # Rows of this table can be edited; ArchivedComplaint rows cannot
+    is_archived = False
     
     def __str__(self):
         return f"{self.title} - {self.get_status_display()}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status/category so signal handlers can tell
+        # what a later save() changed without re-reading the row.
+        instance._loaded_values = {
+            name: getattr(instance, name)
+            for name in ('status', 'category')
+            if name in field_names
+        }
+        return instance
+
+
+class ElectricityBillQuerySet(models.QuerySet):
+    TOTALS = {
+        'total': Count('id'),
+        'due': Count('id', filter=Q(status='Due')),
+        'cleared': Count('id', filter=Q(status='Cleared')),
+        'total_amount': Sum('amount'),
+        'due_amount': Sum('amount', filter=Q(status='Due')),
+        'cleared_amount': Sum('amount', filter=Q(status='Cleared')),
+    }
+    
+    @staticmethod
+    def _zero_empty_sums(totals):
+        for key in ('total_amount', 'due_amount', 'cleared_amount'):
+            if totals[key] is None:
+                totals[key] = Decimal('0.00')
+        return totals
+    
+    def totals(self):
+        """Bill counts and amounts, split by status, in a single query."""
+        return self._zero_empty_sums(self.order_by().aggregate(**self.TOTALS))
+    
+    async def atotals(self):
+        return self._zero_empty_sums(await self.order_by().aaggregate(**self.TOTALS))
 
 
 class ElectricityBill(models.Model):
@@ -39,7 +98,8 @@ class ElectricityBill(models.Model):
         ('Cleared', 'Cleared'),
     ]
     
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='electricity_bills')
+    # Indexed by bill_user_created_idx
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='electricity_bills', db_index=False)
     bill_number = models.CharField(max_length=50, unique=True)
     consumer_name = models.CharField(max_length=100)
     address = models.TextField()
@@ -49,13 +109,102 @@ class ElectricityBill(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ElectricityBillQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='bill_status_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='bill_created_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='bill_user_created_idx'),
+        ]
+        # On PostgreSQL, migration 0008 also adds pg_trgm GIN indexes over
+        # UPPER(bill_number) and UPPER(consumer_name), which is what Django's
+        # icontains compiles to, so substring search can use them despite
+        # the leading wildcard. They are raw SQL, outside the model state.
+    
+    is_archived = False
     
     def __str__(self):
         return f"Bill #{self.bill_number} - {self.get_status_display()}"
 
 
+class ArchivedComplaint(models.Model):
+    """A resolved complaint moved out of the hot table by ``archive_records``.
+
+    Keeps the original primary key and timestamps, so archived and live
+    rows can be listed together in one (created_at, id) order. Read-only.
+    """
+    
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_complaints', db_index=False)
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    category = models.CharField(max_length=20, choices=Complaint.CATEGORY_CHOICES)
+    status = models.CharField(max_length=20, choices=Complaint.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+    
+    is_archived = True
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='archived_complaint_created_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='archived_complaint_user_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.title} - {self.get_status_display()} (archived)"
+
+
+class ArchivedElectricityBill(models.Model):
+    """A cleared bill moved out of the hot table by ``archive_records``."""
+    
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_electricity_bills', db_index=False)
+    bill_number = models.CharField(max_length=50, db_index=True)
+    consumer_name = models.CharField(max_length=100)
+    address = models.TextField()
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    due_date = models.DateField()
+    status = models.CharField(max_length=10, choices=ElectricityBill.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+    
+    objects = ElectricityBillQuerySet.as_manager()
+    
+    is_archived = True
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='archived_bill_created_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='archived_bill_user_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Bill #{self.bill_number} - {self.get_status_display()} (archived)"
+
+
+class MessageQuerySet(models.QuerySet):
+    def mark_as_read(self):
+        """Mark every unread message in the queryset as read with one UPDATE.
+
+        Returns the number of messages that changed.
+        """
+        unread = self.filter(is_read=False)
+        recipient_ids = set(unread.order_by().values_list('recipient_id', flat=True).distinct())
+        if not recipient_ids:
+            return 0
+        updated = unread.update(is_read=True, read_at=timezone.now())
+        for recipient_id in recipient_ids:
+            UserProfile.reconcile(recipient_id)
+        return updated
+
+
 class Message(models.Model):
     PRIORITY_CHOICES = [
         ('Low', 'Low'),
@@ -64,8 +213,9 @@ class Message(models.Model):
         ('Urgent', 'Urgent'),
     ]
     
-    sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sent_messages')
-    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='received_messages')
+    # Indexed by message_sender_created_idx and message_recipient_created_idx
+    sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sent_messages', db_index=False)
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='received_messages', db_index=False)
     subject = models.CharField(max_length=200)
     content = models.TextField()
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='Medium')
@@ -73,14 +223,125 @@ class Message(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     read_at = models.DateTimeField(null=True, blank=True)
     
+    objects = MessageQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient', '-created_at', '-id'], name='message_recipient_created_idx'),
+            models.Index(fields=['sender', '-created_at', '-id'], name='message_sender_created_idx'),
+            # Unread counts and mark-as-read only touch unread rows, which
+            # stay a small fraction of each inbox.
+            models.Index(fields=['recipient'], condition=Q(is_read=False), name='message_unread_idx'),
+        ]
     
     def __str__(self):
         return f"{self.subject} - {self.recipient.username}"
     
     def mark_as_read(self):
-        if not self.is_read:
-            self.is_read = True
-            self.read_at = timezone.now()
-            self.save()
\ No newline at end of file
+        """Mark this message read; a no-op (and no query) if it already is."""
+        if self.is_read:
+            return False
+        read_at = timezone.now()
+        # Guard on is_read in the WHERE clause so concurrent opens of the
+        # same message only decrement the unread counter once.
+        updated = Message.objects.filter(pk=self.pk, is_read=False).update(is_read=True, read_at=read_at)
+        self.is_read = True
+        if updated:
+            self.read_at = read_at
+            UserProfile.adjust_unread(self.recipient_id, -1)
+        return bool(updated)
+    
+    async def amark_as_read(self):
+        """Async counterpart of mark_as_read() for async views."""
+        if self.is_read:
+            return False
+        read_at = timezone.now()
+        updated = await Message.objects.filter(pk=self.pk, is_read=False).aupdate(is_read=True, read_at=read_at)
+        self.is_read = True
+        if updated:
+            self.read_at = read_at
+            await UserProfile.aadjust_unread(self.recipient_id, -1)
+        return bool(updated)
+
+
+class UserProfile(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='profile')
+    unread_messages = models.PositiveIntegerField(default=0)
+    
+    def __str__(self):
+        return f"Profile of {self.user_id}"
+    
+    @classmethod
+    def adjust_unread(cls, user_id, delta):
+        """Add ``delta`` to a user's unread counter without a read-modify-write."""
+        updated = cls.objects.filter(user_id=user_id).update(
+            unread_messages=Greatest(F('unread_messages') + delta, 0)
+        )
+        if not updated and delta > 0:
+            # First message for this user: count from scratch rather than
+            # trusting a counter that never existed.
+            cls.reconcile(user_id)
+    
+    @classmethod
+    async def aadjust_unread(cls, user_id, delta):
+        updated = await cls.objects.filter(user_id=user_id).aupdate(
+            unread_messages=Greatest(F('unread_messages') + delta, 0)
+        )
+        if not updated and delta > 0:
+            await sync_to_async(cls.reconcile)(user_id)
+    
+    @classmethod
+    def increment_unread_many(cls, user_ids):
+        """Bump the unread counter of each user in ``user_ids`` by one."""
+        user_ids = list(user_ids)
+        cls.objects.filter(user_id__in=user_ids).update(unread_messages=F('unread_messages') + 1)
+        existing = set(cls.objects.filter(user_id__in=user_ids).values_list('user_id', flat=True))
+        missing = [user_id for user_id in user_ids if user_id not in existing]
+        if missing:
+            counts = dict(
+                Message.objects.filter(recipient_id__in=missing, is_read=False)
+                .order_by()
+                .values('recipient')
+                .annotate(count=Count('id'))
+                .values_list('recipient', 'count')
+            )
+            cls.objects.bulk_create(
+                [cls(user_id=user_id, unread_messages=counts.get(user_id, 0)) for user_id in missing],
+                ignore_conflicts=True,
+            )
+    
+    @classmethod
+    def reconcile(cls, user_id):
+        """Recount a user's unread messages and store the result."""
+        count = Message.objects.filter(recipient_id=user_id, is_read=False).count()
+        cls.objects.update_or_create(user_id=user_id, defaults={'unread_messages': count})
+        return count
+
+
+class NotificationOutbox(models.Model):
+    STATUS_CHOICES = [
+        ('Pending', 'Pending'),
+        ('Sent', 'Sent'),
+        ('Failed', 'Failed'),
+    ]
+    
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipient = models.CharField(max_length=254)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='Pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['next_attempt_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_status_next_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.subject} -> {self.recipient} ({self.status})"
@@ -0,0 +1,121 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import NotificationOutbox
+
+
+def default_from_email():
+    return settings.EMAIL_HOST_USER or 'noreply@smartcity.com'
+
+
+def queue_notification(subject, message, recipient_list, from_email=None):
+    """Write an email to the outbox once the surrounding transaction commits.
+
+    Delivery happens in the ``dispatch_notifications`` worker, so a slow or
+    failing SMTP server never holds up (or rolls back) the web request.
+    """
+    from_email = from_email or default_from_email()
+    recipients = [address for address in recipient_list if address]
+    if not recipients:
+        return
+
+    def write_outbox():
+        NotificationOutbox.objects.bulk_create([
+            NotificationOutbox(
+                subject=subject,
+                body=message,
+                from_email=from_email,
+                recipient=recipient,
+            )
+            for recipient in recipients
+        ])
+
+    transaction.on_commit(write_outbox)
+
+
+def retry_delay(attempts):
+    """Exponential backoff for the given number of failed attempts."""
+    base = settings.NOTIFICATION_RETRY_BASE_SECONDS
+    delay = base * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(delay, settings.NOTIFICATION_RETRY_MAX_SECONDS))
+
+
+def _record_failure(notification, exc, now):
+    notification.attempts += 1
+    notification.last_error = str(exc)
+    if notification.attempts >= settings.NOTIFICATION_MAX_ATTEMPTS:
+        notification.status = 'Failed'
+    else:
+        notification.next_attempt_at = now + retry_delay(notification.attempts)
+    notification.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+
+
+def claim_batch(batch_size):
+    """Lease up to ``batch_size`` due notifications to this dispatcher.
+
+    The lease pushes ``next_attempt_at`` forward so a second dispatcher
+    process does not pick up the same rows while they are being sent.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            NotificationOutbox.objects
+            .select_for_update(skip_locked=True)
+            .filter(status='Pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if batch:
+            lease_until = now + timedelta(seconds=settings.NOTIFICATION_LEASE_SECONDS)
+            NotificationOutbox.objects.filter(
+                pk__in=[notification.pk for notification in batch]
+            ).update(next_attempt_at=lease_until)
+    return batch
+
+
+def dispatch_batch(batch_size=None):
+    """Send one batch of pending notifications over a single SMTP connection.
+
+    Returns a ``(sent, failed)`` tuple for the batch.
+    """
+    batch = claim_batch(batch_size or settings.NOTIFICATION_BATCH_SIZE)
+    if not batch:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as exc:
+        now = timezone.now()
+        for notification in batch:
+            _record_failure(notification, exc, now)
+        return 0, len(batch)
+
+    try:
+        for notification in batch:
+            email = EmailMessage(
+                notification.subject,
+                notification.body,
+                notification.from_email,
+                [notification.recipient],
+                connection=connection,
+            )
+            try:
+                email.send()
+            except Exception as exc:
+                _record_failure(notification, exc, timezone.now())
+                failed += 1
+            else:
+                notification.status = 'Sent'
+                notification.attempts += 1
+                notification.sent_at = timezone.now()
+                notification.last_error = ''
+                notification.save(update_fields=['status', 'attempts', 'sent_at', 'last_error'])
+                sent += 1
+    finally:
+        connection.close()
+    return sent, failed
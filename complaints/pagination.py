@@ -0,0 +1,86 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+PAGE_SIZE = 50
+
+
+class KeysetPage:
+    """One page of rows ordered newest first by ``(created_at, id)``.
+
+    Unlike offset pagination, fetching page N costs the same as page 1: the
+    cursor names the last row seen and the next page starts right after it.
+    """
+
+    def __init__(self, object_list, next_cursor, is_first):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.is_first = is_first
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def encode_cursor(obj):
+    raw = f"{obj.created_at.isoformat()}|{obj.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return ``(created_at, pk)`` for a cursor, or ``None`` if it is invalid."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def _rows_after(queryset, position, limit):
+    queryset = queryset.order_by('-created_at', '-id')
+    if position:
+        created_at, pk = position
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+    return list(queryset[:limit])
+
+
+def keyset_paginate(queryset, cursor=None, per_page=PAGE_SIZE, merge=()):
+    """Return the page after ``cursor``.
+
+    Querysets in ``merge`` (e.g. the same filter over an archive table,
+    whose rows keep their original ids) are interleaved in the same order;
+    each fetches at most one page from its own index.
+    """
+    position = decode_cursor(cursor)
+    rows = _rows_after(queryset, position, per_page + 1)
+    if merge:
+        for other in merge:
+            rows.extend(_rows_after(other, position, per_page + 1))
+        rows.sort(key=lambda row: (row.created_at, row.pk), reverse=True)
+        rows = rows[:per_page + 1]
+    next_cursor = encode_cursor(rows[per_page - 1]) if len(rows) > per_page else None
+    return KeysetPage(rows[:per_page], next_cursor, is_first=position is None)
+
+
+def page_querystring(params, cursor):
+    """Rebuild the current query string with ``cursor`` swapped in."""
+    query = params.copy()
+    query.pop('cursor', None)
+    if cursor:
+        query['cursor'] = cursor
+    return query.urlencode()
@@ -0,0 +1,154 @@
+import json
+import logging
+import math
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger('complaints.perf')
+
+# Metrics of the request being handled. The object is shared, not copied,
+# into the threads that sync_to_async runs sync code on, so queries and
+# renders there are counted too.
+_current = ContextVar('request_metrics', default=None)
+
+# Server-Timing metric names, in header order
+TIMINGS = ('db', 'connect', 'template', 'mail')
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.seconds = Counter()
+        self.db_queries = 0
+        self.pool = {}
+
+    def as_log(self, request, response, total_ms):
+        match = request.resolver_match
+        fragment_cache = getattr(request, 'fragment_cache', None) or {}
+        return {
+            'event': 'request',
+            'method': request.method,
+            'path': request.path,
+            'url_name': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 2),
+            'db_queries': self.db_queries,
+            **{f'{kind}_ms': round(self.seconds[kind] * 1000, 2) for kind in TIMINGS},
+            **self.pool,
+            **{f'fragment_cache_{outcome}': count for outcome, count in fragment_cache.items()},
+        }
+
+
+def begin_request():
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+@contextmanager
+def timed(kind):
+    """Add the time spent in the block to the current request's ``kind``."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.seconds[kind] += time.perf_counter() - start
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.seconds['db'] += time.perf_counter() - start
+        metrics.db_queries += 1
+
+
+def install_db_wrapper(sender, connection, **kwargs):
+    """connection_created receiver: time every query on every connection."""
+    if db_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_execute_wrapper)
+
+
+def record_pool_stats(stats):
+    """Note how busy the connection pool was when the request took a connection."""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.pool = {
+            'pool_size': stats.get('pool_size', 0),
+            'pool_available': stats.get('pool_available', 0),
+            'pool_waiting': stats.get('requests_waiting', 0),
+        }
+
+
+def server_timing(metrics, total_ms):
+    parts = [f'total;dur={total_ms:.1f}']
+    for kind in TIMINGS:
+        entry = f'{kind};dur={metrics.seconds[kind] * 1000:.1f}'
+        if kind == 'db':
+            entry += f';desc="{metrics.db_queries} queries"'
+        parts.append(entry)
+    return ', '.join(parts)
+
+
+def log_request(request, response, metrics, total_ms):
+    logger.info(json.dumps(metrics.as_log(request, response, total_ms)))
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        with timed('template'):
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Django template backend that adds render time to the request metrics."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+class TimedEmailBackend(BaseEmailBackend):
+    """Send through EMAIL_DELIVERY_BACKEND, adding the time to the request metrics."""
+
+    def __init__(self, fail_silently=False, **kwargs):
+        super().__init__(fail_silently=fail_silently)
+        self.backend = get_connection(settings.EMAIL_DELIVERY_BACKEND, fail_silently=fail_silently, **kwargs)
+
+    def open(self):
+        with timed('mail'):
+            return self.backend.open()
+
+    def close(self):
+        with timed('mail'):
+            return self.backend.close()
+
+    def send_messages(self, email_messages):
+        with timed('mail'):
+            return self.backend.send_messages(email_messages)
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
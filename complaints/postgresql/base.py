@@ -0,0 +1,18 @@
+from django.db.backends.postgresql import base
+
+from complaints.perf import record_pool_stats, timed
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend that adds connect time to the request metrics.
+
+    With DB_POOL this is the time spent waiting for a connection from the
+    pool (plus its health check); otherwise it is a full connect.
+    """
+
+    def get_new_connection(self, conn_params):
+        with timed('connect'):
+            connection = super().get_new_connection(conn_params)
+        if self.pool:
+            record_pool_stats(self.pool.get_stats())
+        return connection
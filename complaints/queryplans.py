@@ -0,0 +1,83 @@
+import re
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from .benchmarks import fetch
+
+EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE', 'WITH')
+
+# SQLite reports "SCAN <table>" for a full table scan. "SCAN <table> USING
+# ... INDEX" walks an index in order instead (a LIMIT stops it early), and
+# FTS5 lookups show up as "SCAN <table> VIRTUAL TABLE INDEX".
+SQLITE_SCAN = re.compile(r'^SCAN (\w+)$')
+SQLITE_SORT = 'USE TEMP B-TREE FOR ORDER BY'
+POSTGRES_SCAN = re.compile(r'Seq Scan on (\w+)')
+
+# Problems a view has by design: exports stream whole tables, the admin
+# pages' ETag validators, totals and (cached) city-wide stats aggregate
+# over every row, and search results are ordered by relevance rank.
+EXPECTED = {
+    'search_complaints': {'sort without an index'},
+    'admin_dashboard': {
+        'sequential scan of complaints_complaint',
+        'sequential scan of complaints_archivedcomplaint',
+    },
+    'export_complaints': {'sequential scan of complaints_complaint'},
+    'admin_electricity_bills': {
+        'sequential scan of complaints_electricitybill',
+        'sequential scan of complaints_archivedelectricitybill',
+    },
+    'export_bills': {'sequential scan of complaints_electricitybill'},
+    'admin_messages': {'sequential scan of complaints_message'},
+}
+
+
+def view_queries(cases):
+    """url name -> the distinct explainable SQL statements a GET of it runs."""
+    client = Client()
+    statements = {}
+    for name, (user, url) in cases.items():
+        client.logout()
+        if user is not None:
+            client.force_login(user)
+        connection.queries_log.clear()
+        with CaptureQueriesContext(connection) as queries:
+            fetch(client, url)
+        sql = [query['sql'] for query in queries.captured_queries]
+        statements[name] = list(dict.fromkeys(
+            statement for statement in sql if statement.lstrip().upper().startswith(EXPLAINABLE)
+        ))
+    return statements
+
+
+def explain(sql):
+    """The plan of ``sql`` as a list of lines, from the database in use."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+        cursor.execute(f'EXPLAIN {sql}')
+        return [row[0] for row in cursor.fetchall()]
+
+
+def plan_problems(plan, vendor=None):
+    """Full table scans and in-memory sorts in a plan, as short descriptions."""
+    vendor = vendor or connection.vendor
+    problems = []
+    for line in plan:
+        line = line.strip()
+        if vendor == 'sqlite':
+            # Older SQLite versions say "SCAN TABLE <table>"
+            line = line.replace('SCAN TABLE ', 'SCAN ')
+            match = SQLITE_SCAN.match(line)
+            if match:
+                problems.append(f'sequential scan of {match.group(1)}')
+            elif line == SQLITE_SORT:
+                problems.append('sort without an index')
+        else:
+            match = POSTGRES_SCAN.search(line)
+            if match:
+                problems.append(f'sequential scan of {match.group(1)}')
+    return problems
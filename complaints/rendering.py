@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import get_template
+
+
+def project_templates():
+    """Names of every template under the project TEMPLATES dirs."""
+    names = []
+    for config in settings.TEMPLATES:
+        for directory in config.get('DIRS', []):
+            directory = Path(directory)
+            names.extend(
+                path.relative_to(directory).as_posix()
+                for path in sorted(directory.rglob('*.html'))
+            )
+    return names
+
+
+def warm_template_cache():
+    """Compile every project template into the cached loader.
+
+    Called once per worker at startup so the first requests don't pay to
+    parse base.html and friends.
+    """
+    for name in project_templates():
+        get_template(name)
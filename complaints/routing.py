@@ -0,0 +1,125 @@
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Set while a @replica_reads view runs. ContextVars follow the request into
+# the threads sync_to_async uses, so async views are covered too.
+_replica_reads = ContextVar('replica_reads', default=False)
+
+# Set on the response to any write; while it is in the future the user's
+# reads stay on the primary so they see their own changes despite lag.
+PIN_COOKIE = 'db_primary_until'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+# Per request, a list the router appends to whenever the request writes.
+# A mutable holder rather than a flag, so that writes made on the threads
+# sync_to_async uses are seen by the middleware that set it.
+_request_writes = ContextVar('request_writes', default=None)
+
+
+def pinned_to_primary(request):
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def read_database(request):
+    """The alias a read-only view should read ``request``'s data from."""
+    if settings.READ_REPLICA_ALIAS and not pinned_to_primary(request):
+        return settings.READ_REPLICA_ALIAS
+    return DEFAULT_DB_ALIAS
+
+
+def replica_reads(view):
+    """Send the view's reads to the read replica, if one is configured.
+
+    Only for views that never write: anything they read may lag the
+    primary by the replication delay. Users who wrote in the last
+    REPLICA_PIN_SECONDS keep reading from the primary. Querysets evaluated
+    after the view returns (streamed responses) are not covered; pin those
+    with ``.using(read_database(request))``.
+    """
+
+    if iscoroutinefunction(view):
+
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            token = _replica_reads.set(read_database(request) != DEFAULT_DB_ALIAS)
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _replica_reads.reset(token)
+
+    else:
+
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            token = _replica_reads.set(read_database(request) != DEFAULT_DB_ALIAS)
+            try:
+                return view(request, *args, **kwargs)
+            finally:
+                _replica_reads.reset(token)
+
+    return inner
+
+
+def track_writes():
+    """Start recording this request's writes; returns the record and a reset token."""
+    writes = []
+    return writes, _request_writes.set(writes)
+
+
+def reset_write_tracking(token):
+    _request_writes.reset(token)
+
+
+def pin_after_write(request, response, writes=()):
+    """Keep the user on the primary for a while after a request that wrote.
+
+    That is any non-safe request, plus safe ones that wrote anyway (opening
+    a message marks it read).
+    """
+    if settings.READ_REPLICA_ALIAS and (writes or request.method not in SAFE_METHODS):
+        until = time.time() + settings.REPLICA_PIN_SECONDS
+        response.set_cookie(PIN_COOKIE, f'{until:.0f}', max_age=settings.REPLICA_PIN_SECONDS,
+                            httponly=True, samesite='Lax')
+    return response
+
+
+class ReplicaRouter:
+    """Route reads inside @replica_reads views to READ_REPLICA_ALIAS.
+
+    Everything else, including every write and any read inside a
+    transaction on the primary, uses the default database.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = settings.READ_REPLICA_ALIAS
+        if alias and _replica_reads.get() and not connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        writes = _request_writes.get()
+        if writes is not None and not writes:
+            writes.append(model._meta.label)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        databases = {DEFAULT_DB_ALIAS, settings.READ_REPLICA_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from the primary
+        if settings.READ_REPLICA_ALIAS and db == settings.READ_REPLICA_ALIAS:
+            return False
+        return None
@@ -0,0 +1,87 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+
+SEARCH_CONFIG = 'english'
+SEARCH_RESULTS_LIMIT = 50
+
+# Must match the expression of ``complaint_search_idx`` (migration 0007)
+# for PostgreSQL to answer the query from the GIN index.
+COMPLAINT_VECTOR = SearchVector('title', 'description', config=SEARCH_CONFIG)
+
+WORD_RE = re.compile(r'\w+')
+
+
+def fts5_query(text):
+    """Turn free text into an FTS5 query that ANDs the quoted words.
+
+    Quoting every token keeps user input from being parsed as FTS5 syntax
+    (``AND``, ``NEAR``, column filters, unbalanced quotes).
+    """
+    return ' '.join(f'"{word}"' for word in WORD_RE.findall(text))
+
+
+def search_complaints(queryset, text, limit=SEARCH_RESULTS_LIMIT):
+    """Rank ``queryset`` complaints by relevance of title/description to ``text``.
+
+    Uses the GIN-indexed ``to_tsvector`` on PostgreSQL and the FTS5 shadow
+    table on SQLite. Returns a sliced queryset annotated with ``rank``,
+    best match first.
+    """
+    if connection.vendor == 'postgresql':
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+        results = (
+            queryset.annotate(search=COMPLAINT_VECTOR, rank=SearchRank(COMPLAINT_VECTOR, query))
+            .filter(search=query)
+            .order_by('-rank', '-created_at')
+        )
+        return results[:limit]
+
+    match = fts5_query(text)
+    if not match:
+        return queryset.none()
+    table = queryset.model._meta.db_table
+    # FTS5's ``rank`` is bm25, where lower is better; negate it so that
+    # callers can always sort by ``-rank``.
+    results = (
+        queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH %s', [match]
+        ))
+        .annotate(rank=RawSQL(
+            f'SELECT -rank FROM {table}_fts WHERE {table}_fts MATCH %s AND rowid = {table}.id',
+            [match],
+        ))
+        .order_by(F('rank').desc(), '-created_at')
+    )
+    return results[:limit]
+
+
+def search_bills(queryset, text):
+    """Filter ``queryset`` bills by bill number or consumer name.
+
+    A query that is exactly an existing bill number is answered from the
+    unique index on ``bill_number``. Anything else falls back to a
+    case-insensitive substring match, which the pg_trgm indexes serve on
+    PostgreSQL.
+    """
+    text = text.strip()
+    if not text:
+        return queryset
+    exact = queryset.filter(bill_number=text)
+    if exact.exists():
+        return exact
+    return queryset.filter(Q(bill_number__icontains=text) | Q(consumer_name__icontains=text))
+
+
+async def asearch_bills(queryset, text):
+    """Async counterpart of search_bills() for async views."""
+    text = text.strip()
+    if not text:
+        return queryset
+    exact = queryset.filter(bill_number=text)
+    if await exact.aexists():
+        return exact
+    return queryset.filter(Q(bill_number__icontains=text) | Q(consumer_name__icontains=text))
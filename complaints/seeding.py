@@ -0,0 +1,129 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from .models import Complaint, ElectricityBill, Message, UserProfile
+from .stats import ComplaintStats
+
+# Usernames of generated accounts start with this, so a city can be flushed
+USERNAME_PREFIX = 'seed-'
+
+FIRST_NAMES = ['Asha', 'Ravi', 'Meera', 'Arjun', 'Kavya', 'Vikram', 'Priya', 'Rahul', 'Divya', 'Suresh']
+LAST_NAMES = ['Sharma', 'Iyer', 'Reddy', 'Nair', 'Patel', 'Gupta', 'Rao', 'Das', 'Khan', 'Singh']
+STREETS = ['Market Road', 'Lake View', 'Station Road', 'MG Road', 'Temple Street', 'Ring Road']
+ISSUES = {
+    'Water': ['Pipe burst', 'No water supply', 'Contaminated water', 'Low pressure'],
+    'Waste': ['Garbage not collected', 'Overflowing bin', 'Illegal dumping'],
+    'Electricity': ['Streetlight out', 'Frequent outages', 'Exposed wiring'],
+    'Roads': ['Pothole', 'Broken footpath', 'Waterlogging', 'Missing signboard'],
+    'Others': ['Stray animals', 'Noise complaint', 'Blocked drain'],
+}
+NOTICES = ['Scheduled maintenance', 'Water supply interruption', 'Bill payment reminder',
+           'Road closure', 'Vaccination drive', 'Property tax deadline']
+
+
+def seeded_users():
+    return User.objects.filter(username__startswith=USERNAME_PREFIX)
+
+
+def flush_city():
+    """Delete every generated account and, by cascade, everything it owns."""
+    deleted, _ = seeded_users().delete()
+    ComplaintStats.invalidate()
+    return deleted
+
+
+@transaction.atomic
+def seed_city(users=100, complaints=5, bills=3, messages=4, seed=42, batch_size=1000, password=None):
+    """Generate a city of ``users`` citizens plus one admin with bulk_create.
+
+    ``complaints``, ``bills`` and ``messages`` are per citizen. The same
+    seed always produces the same rows (apart from primary keys and
+    timestamps). Every account gets ``password``; without one they cannot
+    log in with a password at all. bulk_create skips model signals, so the
+    unread counters are written directly and the cached complaint stats
+    are dropped. Returns the number of rows created per model.
+    """
+    rng = random.Random(seed)
+    password = make_password(password)
+
+    admin = User.objects.create(username=f'{USERNAME_PREFIX}admin', email='seed-admin@example.com',
+                                first_name='City', last_name='Admin', is_staff=True, password=password)
+    User.objects.bulk_create([
+        User(
+            username=f'{USERNAME_PREFIX}citizen-{n:06d}',
+            email=f'citizen-{n:06d}@example.com',
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+            password=password,
+        )
+        for n in range(users)
+    ], batch_size=batch_size)
+    # Re-read for primary keys, which SQLite's bulk_create does not return
+    citizens = list(
+        User.objects.filter(username__startswith=f'{USERNAME_PREFIX}citizen-').order_by('username')
+    )
+
+    categories = list(ISSUES)
+    statuses = [value for value, _ in Complaint.STATUS_CHOICES]
+    Complaint.objects.bulk_create((
+        Complaint(
+            user=citizen,
+            title=f'{rng.choice(ISSUES[category])} on {rng.choice(STREETS)}',
+            description=f'Reported near house {rng.randrange(1, 500)}, {rng.choice(STREETS)}. '
+                        f'{rng.choice(ISSUES[category])} for {rng.randrange(1, 30)} days.',
+            category=category,
+            status=rng.choices(statuses, weights=(5, 2, 3))[0],
+        )
+        for citizen in citizens
+        for category in (rng.choice(categories) for _ in range(complaints))
+    ), batch_size=batch_size)
+
+    today = date(2026, 1, 1)
+    ElectricityBill.objects.bulk_create((
+        ElectricityBill(
+            user=citizen,
+            bill_number=f'SEED{seed}-{i:06d}-{n:03d}',
+            consumer_name=f'{citizen.first_name} {citizen.last_name}',
+            address=f'{rng.randrange(1, 500)} {rng.choice(STREETS)}',
+            amount=Decimal(rng.randrange(10_000, 500_000)) / 100,
+            due_date=today + timedelta(days=30 * n + rng.randrange(28)),
+            status='Due' if rng.random() < 0.4 else 'Cleared',
+        )
+        for i, citizen in enumerate(citizens)
+        for n in range(bills)
+    ), batch_size=batch_size)
+
+    priorities = [value for value, _ in Message.PRIORITY_CHOICES]
+    unread = dict.fromkeys((citizen.pk for citizen in citizens), 0)
+    inbox = []
+    for citizen in citizens:
+        for _ in range(messages):
+            is_read = rng.random() < 0.5
+            unread[citizen.pk] += not is_read
+            inbox.append(Message(
+                sender=admin,
+                recipient=citizen,
+                subject=rng.choice(NOTICES),
+                content=f'Dear {citizen.first_name}, please note: {rng.choice(NOTICES).lower()} '
+                        f'in ward {rng.randrange(1, 60)}.',
+                priority=rng.choice(priorities),
+                is_read=is_read,
+            ))
+    Message.objects.bulk_create(inbox, batch_size=batch_size)
+    UserProfile.objects.bulk_create(
+        [UserProfile(user_id=user_id, unread_messages=count) for user_id, count in unread.items()],
+        batch_size=batch_size,
+    )
+
+    transaction.on_commit(ComplaintStats.invalidate)
+    return {
+        'users': len(citizens) + 1,
+        'complaints': len(citizens) * complaints,
+        'bills': len(citizens) * bills,
+        'messages': len(inbox),
+    }
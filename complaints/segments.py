@@ -0,0 +1,32 @@
+from django.contrib.auth.models import User
+
+
+def all_citizens(category=None):
+    return User.objects.filter(is_staff=False, is_active=True)
+
+
+def open_complaints(category=None):
+    complaints = {'complaints__status__in': ['Pending', 'In Progress']}
+    if category:
+        complaints['complaints__category'] = category
+    return all_citizens().filter(**complaints)
+
+
+def due_bills(category=None):
+    return all_citizens().filter(electricity_bills__status='Due')
+
+
+# key -> (label, function returning the recipient User queryset)
+SEGMENTS = {
+    'all_citizens': ('All citizens', all_citizens),
+    'open_complaints': ('Citizens with open complaints', open_complaints),
+    'due_bills': ('Citizens with due electricity bills', due_bills),
+}
+
+SEGMENT_CHOICES = [(key, label) for key, (label, _) in SEGMENTS.items()]
+
+
+def resolve_segment(key, category=None):
+    """Return the distinct ids of the users in a broadcast segment."""
+    _, build = SEGMENTS[key]
+    return build(category).order_by('pk').values_list('pk', flat=True).distinct()
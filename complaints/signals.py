@@ -1,13 +1,15 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
+from django.db import transaction
 from django.dispatch import receiver
-from django.core.mail import send_mail
-from django.conf import settings
-from .models import Complaint
+from .models import Complaint, Message, UserProfile
+from .notifications import queue_notification
+from .stats import ComplaintStats
+from .fragments import bump_dashboard_version
 
 
 @receiver(post_save, sender=Complaint)
 def send_complaint_notification(sender, instance, created, **kwargs):
-    """Send email notification when a new complaint is created or status is updated"""
+    """Queue email notification when a new complaint is created or status is updated"""
     if created:
         # New complaint created
         subject = f'New Complaint Submitted: {instance.title}'
@@ -51,10 +53,35 @@ Best regards,
 Smart City Administration
         '''
     
-    send_mail(
-        subject,
-        message,
-        settings.EMAIL_HOST_USER or 'noreply@smartcity.com',
-        [instance.user.email],
-        fail_silently=False,
-    )
+    queue_notification(subject, message, [instance.user.email])
+
+
+@receiver(post_save, sender=Complaint)
+def update_complaint_caches_on_save(sender, instance, created, **kwargs):
+    """Keep cached dashboard counts and fragments in step with the saved complaint"""
+    ComplaintStats.record_save(instance, created)
+    # Bump after commit so a concurrent render cannot cache pre-commit data
+    # under the new version.
+    transaction.on_commit(lambda: bump_dashboard_version(instance.user_id))
+    instance._loaded_values = {'status': instance.status, 'category': instance.category}
+
+
+@receiver(post_delete, sender=Complaint)
+def update_complaint_caches_on_delete(sender, instance, **kwargs):
+    """Remove a deleted complaint from the cached dashboard counts and fragments"""
+    ComplaintStats.record_delete(instance)
+    transaction.on_commit(lambda: bump_dashboard_version(instance.user_id))
+
+
+@receiver(post_save, sender=Message)
+def count_new_unread_message(sender, instance, created, **kwargs):
+    """Bump the recipient's unread counter for a new message"""
+    if created and not instance.is_read:
+        UserProfile.adjust_unread(instance.recipient_id, 1)
+
+
+@receiver(post_delete, sender=Message)
+def uncount_deleted_unread_message(sender, instance, **kwargs):
+    """Drop a deleted unread message from the recipient's counter"""
+    if not instance.is_read:
+        UserProfile.adjust_unread(instance.recipient_id, -1)
@@ -0,0 +1,126 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count
+from django.utils.text import slugify
+
+from .models import ArchivedComplaint, Complaint
+
+
+class ComplaintStats:
+    """City-wide complaint counts by status and category.
+
+    The counts come from one GROUP BY query over the live and archive
+    tables and are cached as one counter per status, per category and for
+    the total, so the admin dashboard header is a single ``get_many`` on a
+    hit. Complaint signals adjust the counters with atomic ``incr`` once
+    the write commits: concurrent saves don't lose updates and a rolled
+    back save changes nothing. A missing counter makes the next read
+    recompute all of them. The cache timeout bounds any drift from writes
+    that bypass signals (``QuerySet.update``), and, with the per-process
+    locmem cache, from writes made by other workers.
+    """
+
+    CACHE_KEY = 'complaints:stats'
+
+    @staticmethod
+    def empty():
+        return {
+            'total': 0,
+            'by_status': {value: 0 for value, _ in Complaint.STATUS_CHOICES},
+            'by_category': {value: 0 for value, _ in Complaint.CATEGORY_CHOICES},
+        }
+
+    @classmethod
+    def key(cls, section, value=None):
+        if section == 'total':
+            return f'{cls.CACHE_KEY}:total'
+        return f'{cls.CACHE_KEY}:{section}:{slugify(value)}'
+
+    @classmethod
+    def keys(cls):
+        """{cache key: (section, value)} for every counter."""
+        keys = {cls.key('total'): ('total', None)}
+        for section, counts in cls.empty().items():
+            if section != 'total':
+                keys.update({cls.key(section, value): (section, value) for value in counts})
+        return keys
+
+    @classmethod
+    def compute(cls):
+        stats = cls.empty()
+        # City-wide numbers: archived complaints still count as resolved.
+        # Always counted on the primary: signals adjust the cached numbers
+        # by deltas, so a lagging replica's counts would stay wrong.
+        live, archived = (
+            model.objects.db_manager(DEFAULT_DB_ALIAS)
+            .order_by().values('status', 'category').annotate(count=Count('id'))
+            for model in (Complaint, ArchivedComplaint)
+        )
+        rows = live.union(archived, all=True)
+        for row in rows:
+            stats['total'] += row['count']
+            stats['by_status'][row['status']] = stats['by_status'].get(row['status'], 0) + row['count']
+            stats['by_category'][row['category']] = stats['by_category'].get(row['category'], 0) + row['count']
+        return stats
+
+    @classmethod
+    def get(cls):
+        keys = cls.keys()
+        cached = cache.get_many(keys)
+        if len(cached) < len(keys):
+            stats = cls.compute()
+            cache.set_many({
+                key: stats['total'] if section == 'total' else stats[section][value]
+                for key, (section, value) in keys.items()
+            }, settings.COMPLAINT_STATS_CACHE_SECONDS)
+            return stats
+        stats = cls.empty()
+        for key, (section, value) in keys.items():
+            if section == 'total':
+                stats['total'] = cached[key]
+            else:
+                stats[section][value] = cached[key]
+        return stats
+
+    @classmethod
+    def invalidate(cls):
+        cache.delete_many(cls.keys())
+
+    @classmethod
+    def adjust(cls, status, category, delta):
+        """Apply ``delta`` to one (status, category) cell once the transaction commits."""
+
+        def apply():
+            try:
+                for key in (cls.key('total'), cls.key('by_status', status), cls.key('by_category', category)):
+                    cache.incr(key, delta)
+            except ValueError:
+                # A counter is not cached (or expired): recount on next read
+                cls.invalidate()
+
+        transaction.on_commit(apply)
+
+    @classmethod
+    def record_save(cls, complaint, created):
+        if created:
+            cls.adjust(complaint.status, complaint.category, 1)
+            return
+        loaded = getattr(complaint, '_loaded_values', {})
+        if 'status' not in loaded or 'category' not in loaded:
+            # We don't know what the row looked like before this save.
+            transaction.on_commit(cls.invalidate)
+            return
+        old = (loaded['status'], loaded['category'])
+        if old != (complaint.status, complaint.category):
+            cls.adjust(*old, -1)
+            cls.adjust(complaint.status, complaint.category, 1)
+
+    @classmethod
+    def record_delete(cls, complaint):
+        loaded = getattr(complaint, '_loaded_values', {})
+        cls.adjust(
+            loaded.get('status', complaint.status),
+            loaded.get('category', complaint.category),
+            -1,
+        )
@@ -0,0 +1,60 @@
+from functools import lru_cache
+
+from django import template
+from django.utils.html import format_html
+
+from complaints.models import Complaint, ElectricityBill
+
+register = template.Library()
+
+COMPLAINT_STATUS_CLASSES = {
+    'Pending': 'bg-warning status-pending',
+    'In Progress': 'bg-info status-in-progress',
+    'Resolved': 'bg-success status-resolved',
+}
+BILL_STATUS_CLASSES = {
+    'Due': 'bg-warning',
+    'Cleared': 'bg-success',
+}
+PRIORITY_CLASSES = {
+    'Urgent': 'bg-danger',
+    'High': 'bg-warning',
+    'Medium': 'bg-info',
+}
+
+
+def _badges(choices, classes):
+    return {
+        value: format_html('<span class="badge {}">{}</span>', classes[value], label)
+        for value, label in choices
+        if value in classes
+    }
+
+
+# Built once at import: a badge is a dict lookup per row instead of an
+# {% if %}/{% elif %} chain evaluated on every render.
+COMPLAINT_STATUS_BADGES = _badges(Complaint.STATUS_CHOICES, COMPLAINT_STATUS_CLASSES)
+BILL_STATUS_BADGES = _badges(ElectricityBill.STATUS_CHOICES, BILL_STATUS_CLASSES)
+
+
+@register.simple_tag
+def complaint_status_badge(complaint):
+    return COMPLAINT_STATUS_BADGES.get(complaint.status, '')
+
+
+@register.simple_tag
+def bill_status_badge(bill):
+    return BILL_STATUS_BADGES.get(bill.status, '')
+
+
+@lru_cache(maxsize=64)
+def _priority_badge(priority, css_class):
+    classes = PRIORITY_CLASSES.get(priority, 'bg-secondary')
+    if css_class:
+        classes = f'{classes} {css_class}'
+    return format_html('<span class="badge {}">{}</span>', classes, priority)
+
+
+@register.simple_tag
+def priority_badge(message, css_class=''):
+    return _priority_badge(message.priority, css_class)
@@ -0,0 +1,36 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from complaints.images import CONTENT_TYPES, RESPONSIVE_IMAGES, VARIANT_FORMATS, variant_name
+
+register = template.Library()
+
+
+def _srcset(source, widths, image_format):
+    return ', '.join(f'{static(variant_name(source, width, image_format))} {width}w' for width in widths)
+
+
+@register.simple_tag
+def responsive_picture(source, sizes='100vw', alt='', css_class='', loading='lazy'):
+    """Render a <picture> offering every generated variant of ``source``.
+
+    The browser picks the best format it supports and the smallest width
+    that fills ``sizes``; width/height reserve the space before it loads.
+    """
+    image = RESPONSIVE_IMAGES[source]
+    width, height = image['size']
+    widths = image['widths']
+    *modern, fallback = VARIANT_FORMATS
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((CONTENT_TYPES[image_format], _srcset(source, widths, image_format), sizes) for image_format in modern),
+    )
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" class="{}" '
+        'loading="{}" decoding="async"></picture>',
+        sources,
+        static(variant_name(source, widths[len(widths) // 2], fallback)),
+        _srcset(source, widths, fallback),
+        sizes, width, height, alt, css_class, loading,
+    )
@@ -1,3 +1,1139 @@
-from django.test import TestCase
+import asyncio
+import csv
+import json
+import os
+import tempfile
+import time
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.staticfiles import finders
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.template import Context, Template, engines
+from django.template.loaders.cached import Loader as CachedLoader
+from django.test import (
+    AsyncClient, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from SmartCitySystem import settings as project_settings
+
+from .models import (
+    ArchivedComplaint, ArchivedElectricityBill, Complaint, ElectricityBill, Message, NotificationOutbox,
+    UserProfile,
+)
+from . import perf
+from .benchmarks import fetch, query_regressions, slowdowns, url_cases
+from .broadcast import broadcast_message
+from .checks import check_connection_budget, check_session_cache, connections_per_worker
+from .conditional import CONDITIONAL_STATS
+from .events import get_broker
+from .exports import COMPLAINT_EXPORT_FIELDS
+from .images import RESPONSIVE_IMAGES, VARIANT_FORMATS, variant_name
+from .notifications import dispatch_batch
+from .middleware import ReplicaPinMiddleware
+from .pagination import keyset_paginate
+from .queryplans import EXPECTED, explain, plan_problems, view_queries
+from .routing import PIN_COOKIE, ReplicaRouter, read_database, replica_reads
+from .seeding import flush_city, seed_city
+from .search import fts5_query, search_bills, search_complaints
+from .stats import ComplaintStats
+
+
+# Query counts are measured as deployed, with sessions read from a cache
+# all workers share. The test process is the only one, so its locmem
+# cache is shared enough.
+cached_sessions = override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+
+
+class NotificationOutboxTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('citizen', 'citizen@example.com', 'pass12345', first_name='Asha')
+
+    def test_complaint_save_queues_instead_of_sending(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Complaint.objects.create(user=self.user, title='Leak', description='Pipe burst', category='Water')
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(NotificationOutbox.objects.filter(status='Pending').count(), 1)
+
+    def test_dispatch_sends_batch_and_marks_sent(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Complaint.objects.create(user=self.user, title='Leak', description='Pipe burst', category='Water')
+        sent, failed = dispatch_batch()
+        self.assertEqual((sent, failed), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(NotificationOutbox.objects.get().status, 'Sent')
+
+    def test_failed_send_is_rescheduled_with_backoff(self):
+        notification = NotificationOutbox.objects.create(
+            subject='Hello', body='Body', from_email='noreply@smartcity.com', recipient='citizen@example.com')
+        with mock.patch('complaints.notifications.EmailMessage.send', side_effect=OSError('smtp down')):
+            sent, failed = dispatch_batch()
+        self.assertEqual((sent, failed), (0, 1))
+        notification.refresh_from_db()
+        self.assertEqual(notification.status, 'Pending')
+        self.assertEqual(notification.attempts, 1)
+        self.assertGreater(notification.next_attempt_at, notification.created_at)
+        self.assertEqual(dispatch_batch(), (0, 0))
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass12345', is_staff=True)
+        self.citizen = User.objects.create_user('citizen', 'citizen@example.com', 'pass12345')
+        for i in range(5):
+            Complaint.objects.create(user=self.citizen, title=f'Complaint {i}', description='-',
+                                     category='Water' if i % 2 else 'Roads')
+
+    def test_cursor_walks_every_row_once(self):
+        seen = []
+        page = keyset_paginate(Complaint.objects.all(), per_page=2)
+        seen.extend(page)
+        while page.has_next:
+            page = keyset_paginate(Complaint.objects.all(), page.next_cursor, per_page=2)
+            seen.extend(page)
+        self.assertEqual([c.pk for c in seen], list(Complaint.objects.order_by('-created_at', '-id').values_list('pk', flat=True)))
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        page = keyset_paginate(Complaint.objects.all(), 'not-a-cursor', per_page=2)
+        self.assertTrue(page.is_first)
+        self.assertEqual(len(page), 2)
+
+    def test_admin_dashboard_filters_by_category(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('admin_dashboard'), {'category': 'Water'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({c.category for c in response.context['complaints']}, {'Water'})
+
+
+class ComplaintStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('citizen', 'citizen@example.com', 'pass12345')
+        self.complaint = Complaint.objects.create(user=self.user, title='Leak', description='-', category='Water')
+
+    def test_counts_match_database_in_one_query(self):
+        Complaint.objects.create(user=self.user, title='Pothole', description='-', category='Roads', status='Resolved')
+        with self.assertNumQueries(1):
+            stats = ComplaintStats.get()
+        self.assertEqual(stats['total'], 2)
+        self.assertEqual(stats['by_status']['Pending'], 1)
+        self.assertEqual(stats['by_status']['Resolved'], 1)
+        self.assertEqual(stats['by_category']['Roads'], 1)
+        with self.assertNumQueries(0):
+            ComplaintStats.get()
+
+    def test_signals_adjust_cached_counts(self):
+        ComplaintStats.get()
+        complaint = Complaint.objects.get(pk=self.complaint.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            complaint.status = 'In Progress'
+            complaint.save()
+            Complaint.objects.create(user=self.user, title='Bins', description='-', category='Waste')
+        with self.assertNumQueries(0):
+            stats = ComplaintStats.get()
+        self.assertEqual(stats, ComplaintStats.compute())
+        with self.captureOnCommitCallbacks(execute=True):
+            complaint.delete()
+        self.assertEqual(ComplaintStats.get(), ComplaintStats.compute())
+
+    def test_rolled_back_save_leaves_counts_alone(self):
+        before = ComplaintStats.get()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                Complaint.objects.create(user=self.user, title='Bins', description='-', category='Waste')
+                raise RuntimeError
+        self.assertEqual(callbacks, [])
+        self.assertEqual(ComplaintStats.get(), before)
+
+    def test_missing_counter_forces_a_recount(self):
+        ComplaintStats.get()
+        cache.delete(ComplaintStats.key('by_category', 'Water'))
+        with self.captureOnCommitCallbacks(execute=True):
+            Complaint.objects.create(user=self.user, title='Bins', description='-', category='Waste')
+        with self.assertNumQueries(1):
+            stats = ComplaintStats.get()
+        self.assertEqual(stats['by_category']['Waste'], 1)
+        self.assertEqual(stats, ComplaintStats.compute())
+
+
+class UnreadCounterTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass12345', is_staff=True)
+        self.citizen = User.objects.create_user('citizen', 'citizen@example.com', 'pass12345')
+
+    def send(self, subject='Notice'):
+        return Message.objects.create(sender=self.admin, recipient=self.citizen, subject=subject, content='-')
+
+    def unread(self):
+        return UserProfile.objects.get(user=self.citizen).unread_messages
+
+    def test_counter_follows_create_read_and_delete(self):
+        first = self.send()
+        second = self.send()
+        self.assertEqual(self.unread(), 2)
+        first.mark_as_read()
+        first.mark_as_read()
+        self.assertEqual(self.unread(), 1)
+        second.delete()
+        first.delete()
+        self.assertEqual(self.unread(), 0)
+
+    def test_mark_as_read_is_a_no_op_when_already_read(self):
+        message = self.send()
+        self.assertTrue(message.mark_as_read())
+        with self.assertNumQueries(0):
+            self.assertFalse(message.mark_as_read())
+        stale = Message.objects.get(pk=message.pk)
+        stale.is_read = False
+        self.assertFalse(stale.mark_as_read())
+        self.assertEqual(self.unread(), 0)
+
+    def test_bulk_mark_selected_and_all(self):
+        first, second, third = self.send('One'), self.send('Two'), self.send('Three')
+        self.client.force_login(self.citizen)
+        self.client.post(reverse('mark_messages_read'), {'message_ids': [first.pk, second.pk]})
+        self.assertEqual(self.unread(), 1)
+        self.assertFalse(Message.objects.get(pk=third.pk).is_read)
+        self.client.post(reverse('mark_messages_read'), {'all': '1'})
+        self.assertEqual(self.unread(), 0)
+        self.assertFalse(Message.objects.filter(is_read=False).exists())
+
+    def test_bulk_mark_only_touches_own_messages(self):
+        other = User.objects.create_user('other', 'other@example.com', 'pass12345')
+        foreign = Message.objects.create(sender=self.admin, recipient=other, subject='Hi', content='-')
+        self.client.force_login(self.citizen)
+        self.client.post(reverse('mark_messages_read'), {'message_ids': [foreign.pk]})
+        self.assertFalse(Message.objects.get(pk=foreign.pk).is_read)
+
+    def test_context_processor_exposes_badge_count(self):
+        self.send()
+        self.client.force_login(self.citizen)
+        response = self.client.get(reverse('citizen_dashboard'))
+        self.assertEqual(response.context['unread_message_count'], 1)
+
+    def test_reconcile_command_repairs_drift(self):
+        self.send()
+        UserProfile.objects.filter(user=self.citizen).update(unread_messages=7)
+        call_command('reconcile_unread_counts', stdout=StringIO())
+        self.assertEqual(self.unread(), 1)
+
+
+class BroadcastTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass12345', is_staff=True)
+        self.water = User.objects.create_user('water', 'water@example.com', 'pass12345')
+        self.power = User.objects.create_user('power', 'power@example.com', 'pass12345')
+        self.idle = User.objects.create_user('idle', 'idle@example.com', 'pass12345')
+        Complaint.objects.create(user=self.water, title='Leak', description='-', category='Water')
+        Complaint.objects.create(user=self.power, title='Outage', description='-', category='Electricity')
+        Complaint.objects.create(user=self.power, title='Flicker', description='-', category='Electricity')
+        Complaint.objects.create(user=self.idle, title='Old', description='-', category='Electricity', status='Resolved')
+
+    def test_broadcast_reaches_segment_once_per_user(self):
+        self.client.force_login(self.admin)
+        self.client.post(reverse('send_broadcast'), {
+            'segment': 'open_complaints', 'category': 'Electricity',
+            'subject': 'Outage notice', 'priority': 'High', 'content': 'Power back at 6pm',
+        })
+        self.assertEqual(list(Message.objects.values_list('recipient__username', flat=True)), ['power'])
+        self.assertEqual(UserProfile.objects.get(user=self.power).unread_messages, 1)
+
+    def test_broadcast_to_all_citizens_skips_staff(self):
+        sent = broadcast_message(self.admin, 'all_citizens', 'Hello', 'Body', 'Low')
+        self.assertEqual(sent, 3)
+        self.assertFalse(Message.objects.filter(recipient=self.admin).exists())
+
+    def test_send_message_looks_up_recipient_by_username(self):
+        self.client.force_login(self.admin)
+        response = self.client.post(reverse('send_message'), {
+            'recipient': 'water', 'subject': 'Hi', 'priority': 'Low', 'content': '-',
+        })
+        self.assertRedirects(response, reverse('admin_messages'))
+        self.assertEqual(Message.objects.get().recipient, self.water)
+
+    def test_autocomplete_matches_prefix(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('recipient_autocomplete'), {'q': 'po'})
+        self.assertEqual([user['username'] for user in response.json()['results']], ['power'])
+
+
+class ComplaintSearchTests(TestCase):
+    def setUp(self):
+        self.citizen = User.objects.create_user('citizen', 'citizen@example.com', 'pass12345')
+        self.other = User.objects.create_user('other', 'other@example.com', 'pass12345')
+        self.leak = Complaint.objects.create(user=self.citizen, title='Water leak on Main St',
+                                             description='Pipe burst near the school', category='Water')
+        Complaint.objects.create(user=self.citizen, title='Streetlight out',
+                                 description='Dark corner, possible water damage', category='Electricity')
+        Complaint.objects.create(user=self.other, title='Water leak at park', description='-', category='Water')
+
+    def test_results_are_ranked_and_scoped_to_owner(self):
+        results = list(search_complaints(Complaint.objects.filter(user=self.citizen), 'water leak'))
+        self.assertEqual(results, [self.leak])
+
+    def test_search_index_follows_edits_and_deletes(self):
+        self.leak.title = 'Sewage overflow'
+        self.leak.description = '-'
+        self.leak.save()
+        self.assertEqual(list(search_complaints(Complaint.objects.all(), 'sewage')), [self.leak])
+        self.leak.delete()
+        self.assertEqual(list(search_complaints(Complaint.objects.all(), 'sewage')), [])
+
+    def test_fts_syntax_in_user_input_is_quoted(self):
+        self.assertEqual(fts5_query('leak" OR NEAR(x'), '"leak" "OR" "NEAR" "x"')
+        self.client.force_login(self.citizen)
+        response = self.client.get(reverse('search_complaints'), {'q': 'water" AND'})
+        self.assertEqual(response.status_code, 200)
+
+
+class BillSearchTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user('citizen', 'citizen@example.com', 'pass12345')
+        for number, name in [('EB-100', 'Asha Rao'), ('EB-1001', 'Ravi Nair'), ('XX-9', 'Meera EB-100')]:
+            ElectricityBill.objects.create(user=user, bill_number=number, consumer_name=name, address='-',
+                                           amount='10.00', due_date='2026-01-01')
+
+    def test_exact_bill_number_short_circuits(self):
+        results = search_bills(ElectricityBill.objects.all(), 'EB-100')
+        self.assertEqual([bill.bill_number for bill in results], ['EB-100'])
+
+    def test_substring_matches_number_or_name(self):
+        results = search_bills(ElectricityBill.objects.all(), 'eb-10')
+        self.assertEqual({bill.bill_number for bill in results}, {'EB-100', 'EB-1001', 'XX-9'})
+
+
+class ImportBillsCommandTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass12345', is_staff=True)
+        ElectricityBill.objects.create(user=self.admin, bill_number='EB-1', consumer_name='Old name', address='-',
+                                       amount='1.00', due_date='2026-01-01', status='Cleared')
+
+    def import_csv(self, content, **options):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, newline='') as handle:
+            handle.write(content)
+        self.addCleanup(os.remove, handle.name)
+        out, err = StringIO(), StringIO()
+        call_command('import_bills', handle.name, owner='admin', stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_upserts_valid_rows_and_reports_invalid_ones(self):
+        out, err = self.import_csv(
+            'bill_number,consumer_name,address,amount,due_date\n'
+            'EB-1,New name,Street 1,120.50,2026-02-01\n'
+            'EB-2,Ravi,Street 2,80.00,2026-02-01\n'
+            'EB-3,Meera,Street 3,not-a-number,2026-02-01\n',
+            batch_size=1,
+        )
+        self.assertIn('Imported 2 bill(s), skipped 1 invalid row(s)', out)
+        self.assertIn('Line 4', err)
+        updated = ElectricityBill.objects.get(bill_number='EB-1')
+        self.assertEqual((updated.consumer_name, updated.amount, updated.status), ('New name', Decimal('120.50'), 'Cleared'))
+        self.assertTrue(ElectricityBill.objects.filter(bill_number='EB-2', user=self.admin).exists())
+
+    def test_import_sends_no_notifications(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.import_csv('bill_number,consumer_name,address,amount,due_date\nEB-9,Asha,-,5.00,2026-03-01\n')
+        self.assertFalse(NotificationOutbox.objects.exists())
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass12345', is_staff=True)
+        Complaint.objects.create(user=self.admin, title='Leak, "big"', description='-', category='Water')
+        Complaint.objects.create(user=self.admin, title='Pothole', description='-', category='Roads', status='Resolved')
+        self.client.force_login(self.admin)
+
+    def test_csv_export_streams_filtered_rows(self):
+        response = self.client.get(reverse('export_complaints'), {'category': 'Water'})
+        self.assertTrue(response.streaming)
+        rows = list(csv.reader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(rows[0], COMPLAINT_EXPORT_FIELDS)
+        self.assertEqual([row[1] for row in rows[1:]], ['Leak, "big"'])
+
+    def test_csv_export_defuses_formulas(self):
+        Complaint.objects.create(user=self.admin, title='=HYPERLINK("http://evil")', description='@SUM(A1)',
+                                 category='Others')
+        response = self.client.get(reverse('export_complaints'), {'category': 'Others'})
+        rows = list(csv.reader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(rows[1][1:3], ['\'=HYPERLINK("http://evil")', "'@SUM(A1)"])
+        # NDJSON is data, not a spreadsheet, so it is left as entered
+        response = self.client.get(reverse('export_complaints'), {'category': 'Others', 'format': 'ndjson'})
+        self.assertEqual(json.loads(b''.join(response.streaming_content))['title'], '=HYPERLINK("http://evil")')
+
+    def test_ndjson_export(self):
+        response = self.client.get(reverse('export_complaints'), {'format': 'ndjson', 'status': 'Resolved'})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['title'] for line in lines], ['Pothole'])
+
+    async def test_asgi_export_streams_asynchronously(self):
+        await self.async_client.aforce_login(self.admin)
+        response = await self.async_client.get(reverse('export_complaints'), {'format': 'ndjson'})
+        self.assertTrue(response.is_async)
+        lines = [line async for line in response.streaming_content]
+        self.assertEqual(sorted(json.loads(line)['title'] for line in lines), ['Leak, "big"', 'Pothole'])
+
+    def test_export_requires_staff(self):
+        citizen = User.objects.create_user('citizen', 'citizen@example.com', 'pass12345')
+        self.client.force_login(citizen)
+        self.assertRedirects(self.client.get(reverse('export_bills')), reverse('electricity_bills'))
+
+
+@cached_sessions
+class DashboardFragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.citizen = User.objects.create_user('citizen', 'citizen@example.com', 'pass12345')
+        self.client.force_login(self.citizen)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.complaint = Complaint.objects.create(user=self.citizen, title='Leak', description='-', category='Water')
+
+    @override_settings(PERF_HEADERS=True)
+    def test_second_render_is_a_hit(self):
+        first = self.client.get(reverse('citizen_dashboard'))
+        self.assertEqual(first['X-Fragment-Cache'], 'hits=0, misses=1')
+        # Only the user row, the page validator and the unread badge; the
+        # session comes from cache
+        with self.assertNumQueries(3):
+            second = self.client.get(reverse('citizen_dashboard'))
+        self.assertEqual(second['X-Fragment-Cache'], 'hits=1, misses=0')
+        self.assertIn('X-Fragment-Cache-Ratio', second)
+        self.assertContains(second, 'Leak')
+
+    def test_complaint_changes_invalidate_fragment(self):
+        self.client.get(reverse('citizen_dashboard'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.complaint.title = 'Sewage'
+            self.complaint.save()
+        response = self.client.get(reverse('citizen_dashboard'))
+        self.assertEqual(response['X-Fragment-Cache'], 'hits=0, misses=1')
+        self.assertContains(response, 'Sewage')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.complaint.delete()
+        self.assertNotContains(self.client.get(reverse('citizen_dashboard')), 'Sewage')
+
+
+class ElectricityBillTotalsTests(TestCase):
+    def test_totals_split_by_status(self):
+        user = User.objects.create_user('citizen', 'citizen@example.com', 'pass12345')
+        ElectricityBill.objects.create(user=user, bill_number='A-1', consumer_name='A', address='-',
+                                       amount='100.50', due_date='2026-01-01')
+        ElectricityBill.objects.create(user=user, bill_number='A-2', consumer_name='A', address='-',
+                                       amount='20.00', due_date='2026-01-01', status='Cleared')
+        with self.assertNumQueries(1):
+            totals = ElectricityBill.objects.filter(user=user).totals()
+        self.assertEqual((totals['total'], totals['due'], totals['cleared']), (2, 1, 1))
+        self.assertEqual(totals['total_amount'], Decimal('120.50'))
+        self.assertEqual(totals['due_amount'], Decimal('100.50'))
+        self.assertEqual(totals['cleared_amount'], Decimal('20.00'))
+
+    def test_totals_of_empty_queryset_are_zero(self):
+        totals = ElectricityBill.objects.none().totals()
+        self.assertEqual(totals['total'], 0)
+        self.assertEqual(totals['total_amount'], Decimal('0.00'))
+
+
+class AsgiTests(TestCase):
+    def test_middleware_chain_is_async_capable(self):
+        # One sync-only middleware would push every async view back onto a thread.
+        for path in settings.MIDDLEWARE:
+            with self.subTest(middleware=path):
+                self.assertTrue(getattr(import_string(path), 'async_capable', False))
+
+    async def test_async_views_render(self):
+        user = await User.objects.acreate_user('citizen', 'citizen@example.com', 'pass12345')
+        await Message.objects.acreate(sender=user, recipient=user, subject='Hello', content='-')
+        await self.async_client.aforce_login(user)
+        response = await self.async_client.get(reverse('user_messages'))
+        self.assertContains(response, 'Hello')
+        self.assertIn('X-Response-Time', response)
+
+
+@override_settings(SSE_KEEPALIVE_SECONDS=1)
+class ComplaintEventsTests(TransactionTestCase):
+    # Sync views run on another thread than the async test body, so
+    # on_commit hooks are easiest to observe with real commits.
+    async def test_status_change_is_pushed_to_owner(self):
+        admin = await User.objects.acreate_user('admin', 'admin@example.com', 'pass12345', is_staff=True)
+        citizen = await User.objects.acreate_user('citizen', 'citizen@example.com', 'pass12345')
+        other = await User.objects.acreate_user('other', 'other@example.com', 'pass12345')
+        complaint = await Complaint.objects.acreate(user=citizen, title='Leak', description='-', category='Water')
+        other_complaint = await Complaint.objects.acreate(user=other, title='Pothole', description='-', category='Roads')
+        broker = get_broker()
+
+        await self.async_client.aforce_login(citizen)
+        response = await self.async_client.get(reverse('complaint_events'))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = response.streaming_content
+        self.assertTrue((await anext(stream)).startswith(b'retry:'))
+
+        admin_client = AsyncClient()
+        await admin_client.aforce_login(admin)
+        for target in (other_complaint, complaint):
+            response = await admin_client.post(
+                reverse('admin_edit_complaint', args=[target.pk]),
+                {'title': target.title, 'description': '-', 'category': target.category, 'status': 'Resolved'},
+            )
+            self.assertEqual(response.status_code, 302)
+        chunk = (await anext(stream)).decode()
+        self.assertTrue(chunk.startswith('event: status\n'))
+        event = json.loads(chunk.split('data: ', 1)[1])
+        self.assertEqual(
+            (event['complaint_id'], event['old_status'], event['status']),
+            (complaint.pk, 'Pending', 'Resolved'),
+        )
+        # Nothing else queued for this user, so the stream idles with keepalives
+        self.assertEqual(await anext(stream), b': keepalive\n\n')
+
+        # The ASGI handler cancels the stream when the client disconnects
+        reading = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        reading.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await reading
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    def test_broker_outage_does_not_fail_the_edit(self):
+        admin = User.objects.create_user('admin', 'admin@example.com', 'pass12345', is_staff=True)
+        complaint = Complaint.objects.create(user=admin, title='Leak', description='-', category='Water')
+        self.client.force_login(admin)
+        broker = mock.Mock()
+        broker.publish.side_effect = ConnectionError('redis is down')
+        with mock.patch('complaints.events.get_broker', return_value=broker), \
+                self.assertLogs('complaints.events', 'ERROR'):
+            response = self.client.post(
+                reverse('admin_edit_complaint', args=[complaint.pk]),
+                {'title': 'Leak', 'description': '-', 'category': 'Water', 'status': 'Resolved'},
+            )
+        self.assertEqual(response.status_code, 302)
+        complaint.refresh_from_db()
+        self.assertEqual(complaint.status, 'Resolved')
+
+    def test_no_stream_under_wsgi(self):
+        citizen = User.objects.create_user('citizen', 'citizen@example.com', 'pass12345')
+        self.client.force_login(citizen)
+        response = self.client.get(reverse('complaint_events'))
+        self.assertEqual(response.status_code, 204)
+        self.assertNotContains(self.client.get(reverse('citizen_dashboard')), 'EventSource')
+
+    async def test_dashboard_subscribes_under_asgi(self):
+        citizen = await User.objects.acreate_user('citizen', 'citizen@example.com', 'pass12345')
+        await self.async_client.aforce_login(citizen)
+        response = await self.async_client.get(reverse('citizen_dashboard'))
+        self.assertContains(response, 'EventSource')
+
+
+@cached_sessions
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        CONDITIONAL_STATS.clear()
+        self.citizen = User.objects.create_user('citizen', 'citizen@example.com', 'pass12345')
+        self.client.force_login(self.citizen)
+        self.complaint = Complaint.objects.create(user=self.citizen, title='Leak', description='-', category='Water')
+
+    @override_settings(PERF_HEADERS=True)
+    def test_unchanged_dashboard_is_not_modified(self):
+        first = self.client.get(reverse('citizen_dashboard'))
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('private', first['Cache-Control'])
+        # User, validator and unread badge; no complaint rows, no rendering
+        with self.assertNumQueries(3):
+            second = self.client.get(reverse('citizen_dashboard'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(CONDITIONAL_STATS, {'rendered': 1, 'not_modified': 1})
+        self.assertEqual(second['X-Conditional-Get'], 'not-modified=1, rendered=1')
+
+    def test_changes_invalidate_etag(self):
+        etag = self.client.get(reverse('citizen_dashboard'))['ETag']
+        self.complaint.status = 'Resolved'
+        self.complaint.save()
+        response = self.client.get(reverse('citizen_dashboard'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        self.complaint.delete()
+        response = self.client.get(reverse('citizen_dashboard'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        # A new message changes the navbar badge
+        admin = User.objects.create_user('admin', 'admin@example.com', 'pass12345', is_staff=True)
+        Message.objects.create(sender=admin, recipient=self.citizen, subject='Hi', content='-')
+        response = self.client.get(reverse('citizen_dashboard'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_pending_flash_message_forces_render(self):
+        etag = self.client.get(reverse('citizen_dashboard'))['ETag']
+        self.client.post(reverse('add_complaint'), {'title': 'New', 'description': '-', 'category': 'Roads'})
+        response = self.client.get(reverse('citizen_dashboard'), HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, 'Complaint submitted successfully!')
+
+    def test_admin_list_is_not_modified(self):
+        admin = User.objects.create_user('admin', 'admin@example.com', 'pass12345', is_staff=True)
+        self.client.force_login(admin)
+        etag = self.client.get(reverse('admin_dashboard'))['ETag']
+        response = self.client.get(reverse('admin_dashboard'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+
+class StaticAssetTests(TestCase):
+    def test_responsive_picture_offers_variants(self):
+        html = Template(
+            "{% load responsive_images %}{% responsive_picture 'img/city-bg.jpg' sizes='100vw' %}"
+        ).render(Context())
+        self.assertIn('<source type="image/avif"', html)
+        self.assertIn('img/city-bg-480w.webp 480w', html)
+        self.assertIn('loading="lazy"', html)
+
+    def test_site_assets_are_static_files(self):
+        response = self.client.get(reverse('home'))
+        # Site CSS/JS ship as cacheable static files, not inline in every page
+        self.assertContains(response, 'css/site.css')
+        self.assertNotContains(response, '<style>')
+
+    def test_variants_exist_for_every_width_and_format(self):
+        for source, spec in RESPONSIVE_IMAGES.items():
+            for width in spec['widths']:
+                for image_format in VARIANT_FORMATS:
+                    name = variant_name(source, width, image_format)
+                    self.assertIsNotNone(finders.find(name), name)
+
+
+class TemplateRenderingTests(TestCase):
+    def test_templates_use_cached_loader(self):
+        loader = engines['django'].engine.template_loaders[0]
+        self.assertIsInstance(loader, CachedLoader)
+
+    def test_badge_tags(self):
+        template = Template(
+            '{% load badges %}{% complaint_status_badge complaint %}|{% bill_status_badge bill %}'
+            "|{% priority_badge message 'ms-2' %}"
+        )
+        html = template.render(Context({
+            'complaint': Complaint(status='In Progress'),
+            'bill': ElectricityBill(status='Cleared'),
+            'message': Message(priority='Low'),
+        }))
+        self.assertHTMLEqual(
+            html,
+            '<span class="badge bg-info status-in-progress">In Progress</span>|'
+            '<span class="badge bg-success">Cleared</span>|'
+            '<span class="badge bg-secondary ms-2">Low</span>',
+        )
+
+    def test_inbox_does_not_hide_flash_messages(self):
+        citizen = User.objects.create_user('citizen', 'citizen@example.com', 'pass12345')
+        Message.objects.create(sender=citizen, recipient=citizen, subject='Hello', content='-')
+        self.client.force_login(citizen)
+        response = self.client.post(reverse('mark_messages_read'), {'all': '1'}, follow=True)
+        self.assertContains(response, 'Marked 1 message(s) as read.')
+        self.assertContains(response, 'Hello', count=1)
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.citizen = User.objects.create_user('citizen', 'citizen@example.com', 'pass12345')
+        self.client.force_login(self.citizen)
+
+    @override_settings(PERF_HEADERS=True)
+    def test_server_timing_header_and_log_line(self):
+        with self.assertLogs('complaints.perf', 'INFO') as logs:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse('electricity_bills'))
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'^total;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries", connect;dur=[\d.]+, template;dur=[\d.]+, mail;dur=')
+        self.assertIn(f'desc="{len(queries)} queries"', timing)
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record['url_name'], 'electricity_bills')
+        self.assertEqual(record['status'], 200)
+        self.assertEqual(record['db_queries'], len(queries))
+        self.assertGreater(record['template_ms'], 0)
+
+    @override_settings(PERF_HEADERS=False)
+    def test_server_details_are_only_logged_by_default(self):
+        with self.assertLogs('complaints.perf', 'INFO') as logs:
+            response = self.client.get(reverse('citizen_dashboard'))
+        for header in ('Server-Timing', 'X-Fragment-Cache-Ratio', 'X-Conditional-Get'):
+            self.assertNotIn(header, response)
+        self.assertIn('X-Response-Time', response)
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record['fragment_cache_misses'], 1)
+        self.assertIn('db_ms', record)
+
+    def test_mail_time_is_recorded(self):
+        with self.settings(EMAIL_BACKEND='complaints.perf.TimedEmailBackend',
+                           EMAIL_DELIVERY_BACKEND='django.core.mail.backends.locmem.EmailBackend'):
+            with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages',
+                            side_effect=lambda messages: time.sleep(0.01) or len(messages)):
+                metrics, token = perf.begin_request()
+                try:
+                    mail.send_mail('Subject', 'Body', 'city@example.com', ['citizen@example.com'])
+                finally:
+                    perf.end_request(token)
+        self.assertGreaterEqual(metrics.seconds['mail'], 0.01)
+
+    def test_perf_report_percentiles(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.log', delete=False) as log:
+            for total in range(1, 101):
+                log.write(json.dumps({'event': 'request', 'url_name': 'home', 'total_ms': total, 'db_queries': 2}) + '\n')
+            log.write('INFO not a record\n')
+            log.write('2026-01-01 ' + json.dumps({'event': 'request', 'url_name': 'login', 'total_ms': 7, 'db_queries': 0}) + '\n')
+        self.addCleanup(os.unlink, log.name)
+        out = StringIO()
+        call_command('perf_report', log.name, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[1].split(), ['home', '100', '50.0', '95.0', '99.0', '2.0'])
+        self.assertEqual(lines[2].split(), ['login', '1', '7.0', '7.0', '7.0', '0.0'])
+
+
+class SeedCityTests(TestCase):
+    def test_same_seed_same_city(self):
+        def snapshot():
+            return (
+                list(Complaint.objects.order_by('user__username', 'id').values_list('title', 'category', 'status')),
+                list(ElectricityBill.objects.order_by('bill_number').values_list('bill_number', 'amount', 'status')),
+                list(Message.objects.order_by('recipient__username', 'id').values_list('subject', 'is_read')),
+            )
+
+        counts = seed_city(users=4, complaints=3, bills=2, messages=5, seed=7)
+        self.assertEqual(counts, {'users': 5, 'complaints': 12, 'bills': 8, 'messages': 20})
+        first = snapshot()
+        flush_city()
+        self.assertFalse(Complaint.objects.exists())
+        seed_city(users=4, complaints=3, bills=2, messages=5, seed=7)
+        self.assertEqual(snapshot(), first)
+
+    def test_command_guards_live_databases(self):
+        with self.assertRaisesMessage(CommandError, '--allow-production'):
+            call_command('seed_city', '--users', '2', stdout=StringIO())
+        self.assertFalse(User.objects.exists())
+        out = StringIO()
+        call_command('seed_city', '--users', '2', '--allow-production', stdout=out)
+        password = out.getvalue().split('with password ')[1].strip()
+        admin = User.objects.get(username='seed-admin')
+        self.assertTrue(admin.check_password(password))
+        self.assertFalse(admin.check_password('seed-pass-123'))
+        # Library callers (benchmarks, tests) get accounts without a usable password
+        flush_city()
+        seed_city(users=1)
+        self.assertFalse(User.objects.get(username='seed-admin').has_usable_password())
+
+    def test_unread_counters_match_messages(self):
+        seed_city(users=3, messages=6, seed=1)
+        for profile in UserProfile.objects.all():
+            self.assertEqual(
+                profile.unread_messages,
+                Message.objects.filter(recipient_id=profile.user_id, is_read=False).count(),
+            )
+
+
+class BenchmarkBaselineTests(TestCase):
+    BASELINE = {
+        'home': {'median_ms': 4.0, 'p95_ms': 5.0, 'queries': 0},
+        'admin_dashboard': {'median_ms': 40.0, 'p95_ms': 50.0, 'queries': 4},
+    }
+
+    def test_within_threshold_passes(self):
+        results = {
+            'home': {'median_ms': 20.0, 'p95_ms': 30.0, 'queries': 0},
+            'admin_dashboard': {'median_ms': 64.0, 'p95_ms': 80.0, 'queries': 4},
+            'new_page': {'median_ms': 100.0, 'p95_ms': 100.0, 'queries': 9},
+        }
+        self.assertEqual(query_regressions(self.BASELINE, results), [])
+        # Fast pages get an absolute floor rather than failing on noise
+        self.assertEqual(slowdowns(self.BASELINE, results, threshold=0.25), {})
+
+    def test_slowdown_and_extra_queries_fail(self):
+        results = {
+            'home': {'median_ms': 4.1, 'p95_ms': 5.0, 'queries': 1},
+            'admin_dashboard': {'median_ms': 66.0, 'p95_ms': 80.0, 'queries': 4},
+        }
+        self.assertEqual(query_regressions(self.BASELINE, results), ['home: 1 queries, baseline 0'])
+        slow = slowdowns(self.BASELINE, results, threshold=0.25)
+        self.assertEqual(list(slow), ['admin_dashboard'])
+        self.assertIn('admin_dashboard: median 66.00ms', slow['admin_dashboard'])
+
+
+class QueryPlanTests(TestCase):
+    def test_sqlite_plan_problems(self):
+        self.assertEqual(plan_problems([
+            'SCAN complaints_complaint',
+            'SEARCH auth_user USING INTEGER PRIMARY KEY (rowid=?)',
+            'USE TEMP B-TREE FOR ORDER BY',
+        ], vendor='sqlite'), ['sequential scan of complaints_complaint', 'sort without an index'])
+        self.assertEqual(plan_problems([
+            'SCAN complaints_complaint USING INDEX complaint_created_idx',
+            'SCAN complaints_complaint_fts VIRTUAL TABLE INDEX 0:M2',
+        ], vendor='sqlite'), [])
+
+    def test_postgres_plan_problems(self):
+        self.assertEqual(plan_problems([
+            'Limit  (cost=0.29..1.53 rows=26 width=8)',
+            '  ->  Seq Scan on complaints_message  (cost=0.00..35.50 rows=10 width=8)',
+        ], vendor='postgresql'), ['sequential scan of complaints_message'])
+
+    def test_user_lists_use_indexes(self):
+        seed_city(users=50, complaints=5, bills=3, messages=4)
+        citizen = User.objects.get(username='seed-citizen-000000')
+        admin = User.objects.get(username='seed-admin')
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        for name, statements in view_queries(url_cases(citizen, admin)).items():
+            for sql in statements:
+                with self.subTest(url=name, sql=sql):
+                    problems = set(plan_problems(explain(sql))) - EXPECTED.get(name, set())
+                    self.assertEqual(problems, set())
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pass12345', is_staff=True)
+        self.citizen = User.objects.create_user('citizen', 'citizen@example.com', 'pass12345')
+        long_ago = timezone.now() - timedelta(days=365)
+        for i in range(3):
+            Complaint.objects.create(user=self.citizen, title=f'Old fix {i}', description='-',
+                                     category='Roads', status='Resolved')
+        Complaint.objects.create(user=self.citizen, title='Still open', description='-', category='Water')
+        Complaint.objects.create(user=self.citizen, title='Just fixed', description='-', category='Water',
+                                 status='Resolved')
+        Complaint.objects.filter(title__startswith='Old fix').update(updated_at=long_ago)
+        ElectricityBill.objects.create(user=self.citizen, bill_number='OLD-1', consumer_name='Citizen',
+                                       address='-', amount='40.00', due_date='2025-01-01', status='Cleared')
+        ElectricityBill.objects.create(user=self.citizen, bill_number='DUE-1', consumer_name='Citizen',
+                                       address='-', amount='10.00', due_date='2026-01-01')
+        ElectricityBill.objects.filter(bill_number='OLD-1').update(updated_at=long_ago)
+
+    def test_batches_resume_and_keep_rows_intact(self):
+        original = Complaint.objects.get(title='Old fix 0')
+        out = StringIO()
+        call_command('archive_records', '--batch-size', '2', '--max-batches', '1', '--only', 'complaints', stdout=out)
+        self.assertEqual(ArchivedComplaint.objects.count(), 2)
+        call_command('archive_records', '--batch-size', '2', stdout=out)
+        self.assertEqual(ArchivedComplaint.objects.count(), 3)
+        self.assertEqual(ArchivedElectricityBill.objects.count(), 1)
+        self.assertEqual(
+            sorted(Complaint.objects.values_list('title', flat=True)), ['Just fixed', 'Still open']
+        )
+        archived = ArchivedComplaint.objects.get(pk=original.pk)
+        self.assertEqual((archived.title, archived.created_at), (original.title, original.created_at))
+        # City-wide counts still include archived complaints
+        self.assertEqual(ComplaintStats.get()['by_status']['Resolved'], 4)
+
+    def test_lists_show_archive_only_on_request(self):
+        call_command('archive_records', stdout=StringIO())
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('admin_dashboard'))
+        self.assertNotContains(response, 'Old fix')
+        response = self.client.get(reverse('admin_dashboard'), {'archive': '1', 'category': 'Roads'})
+        self.assertContains(response, 'Old fix', count=3)
+        self.assertNotContains(response, 'Still open')
+        archived = ArchivedComplaint.objects.first()
+        self.assertNotContains(response, reverse('admin_edit_complaint', args=[archived.pk]))
+
+        response = self.client.get(reverse('admin_electricity_bills'))
+        self.assertNotContains(response, 'OLD-1')
+        # The header totals are city-wide either way
+        self.assertEqual(response.context['totals']['cleared_amount'], Decimal('40.00'))
+        response = self.client.get(reverse('admin_electricity_bills'), {'archive': '1'})
+        self.assertContains(response, 'OLD-1')
+        self.assertEqual(response.context['totals']['total_amount'], Decimal('50.00'))
+
+        self.client.force_login(self.citizen)
+        response = self.client.get(reverse('electricity_bills'))
+        self.assertNotContains(response, 'OLD-1')
+        # Archived bills still count towards the citizen's tiles
+        self.assertEqual(response.context['user_cleared_amount'], Decimal('40.00'))
+        response = self.client.get(reverse('electricity_bills'), {'archive': '1'})
+        self.assertContains(response, 'OLD-1')
+        self.assertEqual(response.context['user_cleared'], 1)
+
+    def test_exports_include_archive_on_request(self):
+        call_command('archive_records', stdout=StringIO())
+        self.client.force_login(self.admin)
+        live = b''.join(self.client.get(reverse('export_bills')).streaming_content).decode()
+        self.assertNotIn('OLD-1', live)
+        both = b''.join(self.client.get(reverse('export_bills'), {'archive': '1'}).streaming_content).decode()
+        self.assertIn('OLD-1', both)
+        self.assertIn('DUE-1', both)
+        response = self.client.get(reverse('export_complaints'), {'archive': '1', 'format': 'ndjson'})
+        titles = [json.loads(line)['title'] for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(sorted(titles), ['Just fixed', 'Old fix 0', 'Old fix 1', 'Old fix 2', 'Still open'])
+
+    def test_archived_bill_numbers_are_not_reused(self):
+        call_command('archive_records', stdout=StringIO())
+        self.client.force_login(self.admin)
+        response = self.client.post(reverse('add_electricity_bill'), {
+            'bill_number': 'OLD-1', 'consumer_name': 'Citizen', 'address': '-',
+            'amount': '5.00', 'due_date': '2026-03-01',
+        })
+        self.assertContains(response, 'An archived bill already has this bill number.')
+        self.assertFalse(ElectricityBill.objects.filter(bill_number='OLD-1').exists())
+
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, newline='') as handle:
+            handle.write('bill_number,consumer_name,address,amount,due_date\n'
+                         'OLD-1,Citizen,-,5.00,2026-03-01\n'
+                         'NEW-1,Citizen,-,7.00,2026-03-01\n')
+        self.addCleanup(os.remove, handle.name)
+        out, err = StringIO(), StringIO()
+        call_command('import_bills', handle.name, owner='admin', stdout=out, stderr=err)
+        self.assertIn('Imported 1 bill(s), skipped 1 invalid row(s)', out.getvalue())
+        self.assertIn('Line 2: bill number OLD-1 belongs to an archived bill', err.getvalue())
+        self.assertFalse(ElectricityBill.objects.filter(bill_number='OLD-1').exists())
+
+    def test_citizen_dashboard_keeps_archived_history(self):
+        self.client.force_login(self.citizen)
+        before = self.client.get(reverse('citizen_dashboard'))
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('archive_records', stdout=StringIO())
+        response = self.client.get(reverse('citizen_dashboard'), HTTP_IF_NONE_MATCH=before['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'Old fix')
+        self.assertContains(response, '<h4 data-status-count="Resolved">4</h4>', html=True)
+        response = self.client.get(reverse('citizen_dashboard'), {'archive': '1'})
+        self.assertContains(response, 'Old fix', count=3)
+        archived = ArchivedComplaint.objects.first()
+        self.assertNotContains(response, reverse('edit_complaint', args=[archived.pk]))
+
+    def test_keyset_pages_merge_archive_in_order(self):
+        call_command('archive_records', stdout=StringIO())
+        querysets = (Complaint.objects.all(), [ArchivedComplaint.objects.all()])
+        seen = []
+        page = keyset_paginate(querysets[0], per_page=2, merge=querysets[1])
+        seen.extend(page)
+        while page.has_next:
+            page = keyset_paginate(querysets[0], page.next_cursor, per_page=2, merge=querysets[1])
+            seen.extend(page)
+        self.assertEqual(len(seen), 5)
+        keys = [(row.created_at, row.pk) for row in seen]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+
+@override_settings(READ_REPLICA_ALIAS='replica', REPLICA_PIN_SECONDS=10)
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def read_alias_in_view(self, request):
+        view = replica_reads(lambda request: self.router.db_for_read(Complaint))
+        return view(request)
+
+    def test_reads_in_replica_views_go_to_replica(self):
+        self.assertEqual(self.read_alias_in_view(self.factory.get('/')), 'replica')
+        # Outside such views, and for writes, the default database is used
+        self.assertIsNone(self.router.db_for_read(Complaint))
+        self.assertEqual(self.router.db_for_write(Complaint), 'default')
+        self.assertFalse(self.router.allow_migrate('replica', 'complaints'))
+
+    def test_async_views_are_routed(self):
+        async def view(request):
+            return await sync_to_async(self.router.db_for_read)(Complaint)
+
+        self.assertEqual(async_to_sync(replica_reads(view))(self.factory.get('/')), 'replica')
+
+    def test_user_is_pinned_to_primary_after_a_write(self):
+        request = self.factory.post('/send-message/')
+        response = ReplicaPinMiddleware(lambda request: HttpResponse())(request)
+        cookie = response.cookies[PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], 10)
+
+        request = self.factory.get('/')
+        request.COOKIES[PIN_COOKIE] = cookie.value
+        self.assertIsNone(self.read_alias_in_view(request))
+        self.assertEqual(read_database(request), 'default')
+
+        request.COOKIES[PIN_COOKIE] = str(time.time() - 1)
+        self.assertEqual(self.read_alias_in_view(request), 'replica')
+
+    def test_safe_requests_that_write_are_pinned(self):
+        def reads_only(request):
+            self.router.db_for_read(Message)
+            return HttpResponse()
+
+        def marks_read(request):
+            self.router.db_for_write(Message)
+            return HttpResponse()
+
+        middleware = ReplicaPinMiddleware(reads_only)
+        self.assertNotIn(PIN_COOKIE, middleware(self.factory.get('/messages/')).cookies)
+        self.assertIn(PIN_COOKIE, ReplicaPinMiddleware(marks_read)(self.factory.get('/messages/1/')).cookies)
+
+        # Writes made on a sync_to_async thread are seen as well
+        async def amarks_read(request):
+            await sync_to_async(marks_read)(request)
+            return HttpResponse()
+
+        response = async_to_sync(ReplicaPinMiddleware(amarks_read))(self.factory.get('/messages/1/'))
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+    def test_reads_stay_on_default_without_a_replica(self):
+        with self.settings(READ_REPLICA_ALIAS=None):
+            self.assertIsNone(self.read_alias_in_view(self.factory.get('/')))
+            response = ReplicaPinMiddleware(lambda request: HttpResponse())(self.factory.post('/'))
+            self.assertNotIn(PIN_COOKIE, response.cookies)
+
+
+class DatabasePoolingTests(SimpleTestCase):
+    POOLED = {
+        'ENGINE': 'complaints.postgresql',
+        'OPTIONS': {'pool': {'min_size': 2, 'max_size': 4, 'timeout': 10}},
+    }
+
+    def test_pooled_postgresql_settings(self):
+        with mock.patch.object(project_settings, 'DB_POOL', True):
+            database = project_settings.database_from_url('postgres://city:secret@db/city')
+        self.assertEqual(database['ENGINE'], 'complaints.postgresql')
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+        self.assertEqual(database['OPTIONS']['pool']['max_size'], project_settings.DB_POOL_MAX_SIZE)
+
+        database = project_settings.database_from_url('postgres://city:secret@db/city')
+        self.assertEqual(database['CONN_MAX_AGE'], project_settings.DB_CONN_MAX_AGE)
+        self.assertNotIn('pool', database.get('OPTIONS', {}))
+
+    def test_pool_wait_is_recorded(self):
+        from django.db.backends.postgresql.base import DatabaseWrapper as PostgresWrapper
+
+        from .postgresql.base import DatabaseWrapper
+
+        pool = mock.Mock()
+        pool.get_stats.return_value = {'pool_size': 4, 'pool_available': 0, 'requests_waiting': 3}
+        with mock.patch.object(PostgresWrapper, 'get_new_connection',
+                               side_effect=lambda params: time.sleep(0.01) or 'connection'), \
+                mock.patch.object(DatabaseWrapper, 'pool', pool):
+            metrics, token = perf.begin_request()
+            try:
+                DatabaseWrapper({**self.POOLED, 'NAME': 'city'}).get_new_connection({})
+            finally:
+                perf.end_request(token)
+        self.assertGreaterEqual(metrics.seconds['connect'], 0.01)
+        self.assertEqual(metrics.pool, {'pool_size': 4, 'pool_available': 0, 'pool_waiting': 3})
+
+    def test_connections_per_worker(self):
+        self.assertEqual(connections_per_worker(self.POOLED), 4)
+        unpooled = {'ENGINE': 'complaints.postgresql', 'OPTIONS': {}}
+        self.assertEqual(connections_per_worker(unpooled), 1)
+        with self.settings(SERVER_MODE='asgi'):
+            self.assertIsNone(connections_per_worker(unpooled))
+
+    @override_settings(WEB_CONCURRENCY=8, DB_RESERVED_CONNECTIONS=5)
+    def test_connection_budget_check(self):
+        database = mock.Mock(vendor='postgresql', settings_dict=self.POOLED)
+        with mock.patch('complaints.checks.connections', {'default': database}), \
+                mock.patch('complaints.checks.server_connection_limit', return_value=37):
+            self.assertEqual(check_connection_budget(None, databases=['default']), [])
+            with self.settings(WEB_CONCURRENCY=9):
+                errors = check_connection_budget(None, databases=['default'])
+        self.assertEqual([error.id for error in errors], ['complaints.E003'])
+        # Without --database the check needs no connection at all
+        self.assertEqual(check_connection_budget(None), [])
+
+    def test_session_cache_check(self):
+        locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        with self.settings(CACHES=locmem, SESSION_ENGINE='django.contrib.sessions.backends.cached_db'):
+            self.assertEqual([error.id for error in check_session_cache(None)], ['complaints.E004'])
+            with self.settings(DEBUG=True):
+                self.assertEqual(check_session_cache(None), [])
+        with self.settings(CACHES=locmem, SESSION_ENGINE='django.contrib.sessions.backends.db'):
+            self.assertEqual(check_session_cache(None), [])
+
+
+class QueryBudgetMixin:
+    """Fail a test when a URL issues more queries than its declared budget.
+
+    Budgets are per page view and must not depend on how many rows the page
+    lists, so tests seed several rows per list before checking them.
+    """
+
+    def assertQueryBudget(self, url, budget, user=None):
+        if user is not None:
+            self.client.force_login(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = fetch(self.client, url)
+        self.assertLess(response.status_code, 400, url)
+        self.assertLessEqual(
+            len(queries), budget,
+            f"{url} ran {len(queries)} queries (budget {budget}):\n"
+            + '\n'.join(query['sql'] for query in queries.captured_queries),
+        )
+        return response
+
+
+@cached_sessions
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    ROWS = 5
+
+    # url name -> maximum queries for one GET, regardless of row count.
+    # Pages behind conditional_page spend one of these on their validator.
+    QUERY_BUDGETS = {
+        'home': 0,
+        'register': 0,
+        'login': 0,
+        'logout': 3,
+        'citizen_dashboard': 5,
+        'complaint_events': 1,
+        'add_complaint': 2,
+        'edit_complaint': 3,
+        'delete_complaint': 3,
+        'search_complaints': 3,
+        'admin_dashboard': 5,
+        'admin_edit_complaint': 3,
+        'admin_delete_complaint': 3,
+        'export_complaints': 2,
+        'electricity_bills': 6,
+        'add_electricity_bill': 2,
+        'edit_electricity_bill': 3,
+        'delete_electricity_bill': 3,
+        'mark_bill_cleared': 3,
+        'admin_electricity_bills': 6,
+        'export_bills': 2,
+        'admin_edit_electricity_bill': 3,
+        'admin_delete_electricity_bill': 3,
+        'user_messages': 4,
+        'view_message': 5,
+        'mark_messages_read': 1,
+        'send_message': 2,
+        'send_broadcast': 2,
+        'recipient_autocomplete': 1,
+        'admin_messages': 4,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', 'admin@example.com', 'pass12345', is_staff=True)
+        cls.citizen = User.objects.create_user('citizen', 'citizen@example.com', 'pass12345')
+        for i in range(cls.ROWS):
+            owner = User.objects.create_user(f'user{i}', f'user{i}@example.com', 'pass12345')
+            Complaint.objects.create(user=owner, title=f'Complaint {i}', description='-', category='Water')
+            Complaint.objects.create(user=cls.citizen, title=f'Mine {i}', description='-', category='Roads')
+            ElectricityBill.objects.create(user=owner, bill_number=f'B-{i}', consumer_name='Owner',
+                                           address='-', amount='10.00', due_date='2026-01-01')
+            ElectricityBill.objects.create(user=cls.citizen, bill_number=f'C-{i}', consumer_name='Citizen',
+                                           address='-', amount='10.00', due_date='2026-01-01')
+            Message.objects.create(sender=cls.admin, recipient=cls.citizen, subject=f'Notice {i}', content='-')
+
+    def test_every_url_declares_a_budget(self):
+        names = {pattern.name for pattern in get_resolver('complaints.urls').url_patterns}
+        self.assertEqual(names - set(self.QUERY_BUDGETS), set())
+
+    def test_every_url_stays_within_budget(self):
+        for name, (user, url) in url_cases(self.citizen, self.admin).items():
+            with self.subTest(url=name):
+                self.client.logout()
+                self.assertQueryBudget(url, self.QUERY_BUDGETS[name], user)
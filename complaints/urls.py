@@ -7,12 +7,15 @@ urlpatterns = [
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
     path('citizen-dashboard/', views.citizen_dashboard, name='citizen_dashboard'),
+    path('complaint-events/', views.complaint_events, name='complaint_events'),
     path('add-complaint/', views.add_complaint, name='add_complaint'),
     path('edit-complaint/<int:complaint_id>/', views.edit_complaint, name='edit_complaint'),
     path('delete-complaint/<int:complaint_id>/', views.delete_complaint, name='delete_complaint'),
+    path('search-complaints/', views.complaint_search, name='search_complaints'),
     path('admin-dashboard/', views.admin_dashboard, name='admin_dashboard'),
     path('admin-edit-complaint/<int:complaint_id>/', views.admin_edit_complaint, name='admin_edit_complaint'),
     path('admin-delete-complaint/<int:complaint_id>/', views.admin_delete_complaint, name='admin_delete_complaint'),
+    path('export-complaints/', views.export_complaints, name='export_complaints'),
     # Electricity Bill URLs
     path('electricity-bills/', views.electricity_bills, name='electricity_bills'),
     path('add-electricity-bill/', views.add_electricity_bill, name='add_electricity_bill'),
@@ -20,11 +23,15 @@ urlpatterns = [
     path('delete-electricity-bill/<int:bill_id>/', views.delete_electricity_bill, name='delete_electricity_bill'),
     path('mark-bill-cleared/<int:bill_id>/', views.mark_bill_cleared, name='mark_bill_cleared'),
     path('admin-electricity-bills/', views.admin_electricity_bills, name='admin_electricity_bills'),
+    path('export-electricity-bills/', views.export_bills, name='export_bills'),
     path('admin-edit-electricity-bill/<int:bill_id>/', views.admin_edit_electricity_bill, name='admin_edit_electricity_bill'),
     path('admin-delete-electricity-bill/<int:bill_id>/', views.admin_delete_electricity_bill, name='admin_delete_electricity_bill'),
     # Message URLs
     path('messages/', views.user_messages, name='user_messages'),
     path('view-message/<int:message_id>/', views.view_message, name='view_message'),
+    path('mark-messages-read/', views.mark_messages_read, name='mark_messages_read'),
     path('send-message/', views.send_message, name='send_message'),
+    path('send-broadcast/', views.send_broadcast, name='send_broadcast'),
+    path('recipient-autocomplete/', views.recipient_autocomplete, name='recipient_autocomplete'),
     path('admin-messages/', views.admin_messages, name='admin_messages'),
 ]
@@ -1,13 +1,33 @@
-from django.shortcuts import render, redirect, get_object_or_404
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
+from django.template.loader import render_to_string
 from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import AuthenticationForm
 from django.contrib import messages
-from django.core.mail import send_mail
-from django.conf import settings
+from django.db import connection
 from django.db.models import Q
-from .models import Complaint, ElectricityBill, Message
-from .forms import RegistrationForm, ComplaintForm, ComplaintUpdateForm, ElectricityBillForm, ElectricityBillUpdateForm, MessageForm
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.contrib.auth.models import User
+from .models import ArchivedComplaint, ArchivedElectricityBill, Complaint, ElectricityBill, Message
+from .forms import RegistrationForm, ComplaintForm, ComplaintUpdateForm, ElectricityBillForm, ElectricityBillUpdateForm, MessageForm, BroadcastMessageForm
+from .archive import include_archive, merge_totals
+from .broadcast import broadcast_message
+from .notifications import queue_notification
+from .pagination import keyset_paginate, page_querystring
+from .stats import ComplaintStats
+from .search import asearch_bills, search_complaints
+from .exports import BILL_EXPORT_FIELDS, COMPLAINT_EXPORT_FIELDS, stream_export
+from .fragments import acached_fragment, adashboard_version
+from .events import format_sse, get_broker, live_updates_available, publish_status_change
+from .routing import read_database, replica_reads
+from .conditional import aresource_state, aunread_state, conditional_page, resource_state, unread_state
+
+logger = logging.getLogger(__name__)
 
 
 def home(request):
@@ -16,9 +36,7 @@ def home(request):
 
 def register_view(request):
     if request.method == 'POST':
-        print("Registration form submitted")  # Debug
         form = RegistrationForm(request.POST)
-        print(f"Form is valid: {form.is_valid()}")  # Debug
         if form.is_valid():
             try:
                 user = form.save()
@@ -26,10 +44,10 @@ def register_view(request):
                 messages.success(request, 'Registration successful! Welcome to Smart City System.')
                 return redirect('citizen_dashboard')
             except Exception as e:
-                print(f"Registration error: {str(e)}")  # Debug
+                logger.exception('Registration failed')
                 messages.error(request, f'Registration failed: {str(e)}')
         else:
-            print(f"Form errors: {form.errors}")  # Debug
+            logger.info('Registration form invalid: %s', form.errors.as_json())
             messages.error(request, 'Please correct the errors below.')
     else:
         form = RegistrationForm()
@@ -38,9 +56,7 @@ def register_view(request):
 
 def login_view(request):
     if request.method == 'POST':
-        print("Login form submitted")  # Debug
         form = AuthenticationForm(request, data=request.POST)
-        print(f"Form is valid: {form.is_valid()}")  # Debug
         if form.is_valid():
             try:
                 user = form.get_user()
@@ -48,10 +64,10 @@ def login_view(request):
                 messages.success(request, f'Welcome back, {user.first_name or user.username}!')
                 return redirect('citizen_dashboard')
             except Exception as e:
-                print(f"Login error: {str(e)}")  # Debug
+                logger.exception('Login failed for %s', form.get_user())
                 messages.error(request, f'Login failed: {str(e)}')
         else:
-            print(f"Form errors: {form.errors}")  # Debug
+            logger.info('Login rejected for %r', request.POST.get('username', ''))
             messages.error(request, 'Invalid username or password. Please try again.')
     else:
         form = AuthenticationForm()
@@ -64,10 +80,109 @@ def logout_view(request):
     return redirect('home')
 
 
+# Async views for the read-heavy pages. Data is loaded with the async ORM;
+# the final render() runs in a worker thread because context processors
+# (auth, unread badge) use the sync ORM.
+arender = sync_to_async(render)
+
+
+async def arequest_user(request):
+    """Resolve the user once for both the async view and the sync render."""
+    request.user = await request.auser()
+    return request.user
+
+
+async def citizen_dashboard_state(request):
+    user = await arequest_user(request)
+    state = [
+        await aresource_state(Complaint.objects.filter(user=user), 'updated_at'),
+        await aunread_state(request),
+    ]
+    if include_archive(request):
+        state.append(await aresource_state(ArchivedComplaint.objects.filter(user=user), 'archived_at'))
+    return state
+
+
+@login_required
+@conditional_page(citizen_dashboard_state)
+async def citizen_dashboard(request):
+    user = await arequest_user(request)
+    show_archive = include_archive(request)
+    
+    async def render_complaints():
+        complaints = [complaint async for complaint in Complaint.objects.filter(user=user)]
+        statuses = [complaint.status for complaint in complaints]
+        # Archived complaints are all resolved; they still count as such
+        archived_count = await ArchivedComplaint.objects.filter(user=user).acount()
+        counts = {
+            'pending': statuses.count('Pending'),
+            'in_progress': statuses.count('In Progress'),
+            'resolved': statuses.count('Resolved') + archived_count,
+            'total': len(complaints) + archived_count,
+        }
+        if show_archive:
+            complaints.extend([complaint async for complaint in ArchivedComplaint.objects.filter(user=user)])
+            complaints.sort(key=lambda complaint: complaint.created_at, reverse=True)
+        return render_to_string(
+            'includes/citizen_complaints.html',
+            {'complaints': complaints, 'counts': counts},
+        )
+    
+    # The complaint tiles and table only change when one of this user's
+    # complaints is saved or deleted (archiving deletes), which bumps the
+    # version (see signals).
+    version = await adashboard_version(user.pk)
+    key = f'dashboard:complaints:{user.pk}:{version}:{"archive" if show_archive else "live"}'
+    complaints_html = await acached_fragment(request, key, render_complaints)
+    return await arender(request, 'citizen_dashboard.html', {
+        'complaints_html': complaints_html,
+        'show_archive': show_archive,
+        'live_updates': live_updates_available(request),
+    })
+
+
+def release_db_connection():
+    """Close this thread's DB connection unless a transaction still needs it."""
+    if not connection.in_atomic_block:
+        connection.close()
+
+
 @login_required
-def citizen_dashboard(request):
-    complaints = Complaint.objects.filter(user=request.user)
-    return render(request, 'citizen_dashboard.html', {'complaints': complaints})
+async def complaint_events(request):
+    """Server-sent events stream of status changes to the user's complaints"""
+    if not live_updates_available(request):
+        # 204 tells EventSource to stop reconnecting
+        return HttpResponse(status=204)
+    user = await arequest_user(request)
+    # The stream stays open for minutes without touching the database, so
+    # don't pin a connection to it.
+    await sync_to_async(release_db_connection)()
+    broker = get_broker()
+    
+    async def stream():
+        queue = broker.subscribe(user.pk)
+        loop = asyncio.get_running_loop()
+        # Ending the stream now and then makes the browser reconnect, which
+        # re-runs authentication and spreads clients across workers.
+        deadline = loop.time() + settings.SSE_STREAM_SECONDS
+        try:
+            yield f'retry: {settings.SSE_RETRY_MILLISECONDS}\n\n'
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), min(settings.SSE_KEEPALIVE_SECONDS, remaining)
+                    )
+                except TimeoutError:
+                    yield ': keepalive\n\n'
+                else:
+                    yield format_sse(event, event='status')
+        finally:
+            broker.unsubscribe(user.pk, queue)
+    
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
 @login_required
@@ -110,13 +225,88 @@ def delete_complaint(request, complaint_id):
 
 
 @login_required
+def complaint_search(request):
+    """Relevance-ranked search over complaint titles and descriptions"""
+    query = request.GET.get('q', '').strip()
+    complaints = Complaint.objects.select_related('user')
+    if not request.user.is_staff:
+        complaints = complaints.filter(user=request.user)
+    
+    results = search_complaints(complaints, query) if query else Complaint.objects.none()
+    context = {
+        'complaints': results,
+        'search_query': query,
+    }
+    return render(request, 'search_complaints.html', context)
+
+
+def filter_complaints(complaints, params):
+    """Apply the admin dashboard's status/category filters"""
+    if params.get('status'):
+        complaints = complaints.filter(status=params['status'])
+    if params.get('category'):
+        complaints = complaints.filter(category=params['category'])
+    return complaints
+
+
+def filter_bills(bills, params):
+    """Apply the admin bill list's status filter"""
+    if params.get('status'):
+        bills = bills.filter(status=params['status'])
+    return bills
+
+
+def admin_dashboard_state(request):
+    if not request.user.is_staff:
+        return None
+    # The header counts cover every complaint, not just the filtered page
+    state = [resource_state(Complaint.objects.all(), 'updated_at'), unread_state(request)]
+    if include_archive(request):
+        state.append(resource_state(ArchivedComplaint.objects.all(), 'archived_at'))
+    return state
+
+
+@login_required
+@replica_reads
+@conditional_page(admin_dashboard_state)
 def admin_dashboard(request):
     if not request.user.is_staff:
         messages.error(request, 'Access denied. Admin privileges required.')
         return redirect('citizen_dashboard')
     
-    complaints = Complaint.objects.all()
-    return render(request, 'admin_dashboard.html', {'complaints': complaints})
+    complaints = filter_complaints(Complaint.objects.select_related('user'), request.GET)
+    status_filter = request.GET.get('status', '')
+    category_filter = request.GET.get('category', '')
+    show_archive = include_archive(request)
+    archived = ()
+    if show_archive:
+        archived = [filter_complaints(ArchivedComplaint.objects.select_related('user'), request.GET)]
+    
+    page = keyset_paginate(complaints, request.GET.get('cursor'), merge=archived)
+    context = {
+        'complaints': page,
+        'page': page,
+        'show_archive': show_archive,
+        'next_query': page_querystring(request.GET, page.next_cursor),
+        'first_query': page_querystring(request.GET, None),
+        'status_filter': status_filter,
+        'category_filter': category_filter,
+        'status_choices': Complaint.STATUS_CHOICES,
+        'category_choices': Complaint.CATEGORY_CHOICES,
+    }
+    
+    stats = ComplaintStats.get()
+    context.update({
+        'total_count': stats['total'],
+        'pending_count': stats['by_status']['Pending'],
+        'in_progress_count': stats['by_status']['In Progress'],
+        'resolved_count': stats['by_status']['Resolved'],
+        'category_counts': [
+            (label, stats['by_category'].get(value, 0))
+            for value, label in Complaint.CATEGORY_CHOICES
+        ],
+    })
+    return render(request, 'admin_dashboard.html', context)
 
 
 @login_required
@@ -125,7 +315,7 @@ def admin_edit_complaint(request, complaint_id):
         messages.error(request, 'Access denied. Admin privileges required.')
         return redirect('citizen_dashboard')
     
-    complaint = get_object_or_404(Complaint, id=complaint_id)
+    complaint = get_object_or_404(Complaint.objects.select_related('user'), id=complaint_id)
     old_status = complaint.status
     
     if request.method == 'POST':
@@ -135,6 +325,7 @@ def admin_edit_complaint(request, complaint_id):
             # Send email notification if status changed
             if old_status != complaint.status:
                 send_status_notification(complaint)
+                publish_status_change(complaint, old_status)
             messages.success(request, 'Complaint updated successfully!')
             return redirect('admin_dashboard')
     else:
@@ -148,7 +339,7 @@ def admin_delete_complaint(request, complaint_id):
         messages.error(request, 'Access denied. Admin privileges required.')
         return redirect('citizen_dashboard')
     
-    complaint = get_object_or_404(Complaint, id=complaint_id)
+    complaint = get_object_or_404(Complaint.objects.select_related('user'), id=complaint_id)
     if request.method == 'POST':
         complaint.delete()
         messages.success(request, 'Complaint deleted successfully!')
@@ -157,7 +348,7 @@ def admin_delete_complaint(request, complaint_id):
 
 
 def send_status_notification(complaint):
-    """Send email notification when complaint status changes"""
+    """Queue email notification when complaint status changes"""
     subject = f'Complaint Status Update: {complaint.title}'
     message = f'''
 Dear {complaint.user.first_name},
@@ -172,50 +363,66 @@ Thank you for using Smart City System.
 Best regards,
 Smart City Administration
     '''
-    send_mail(
-        subject,
-        message,
-        settings.EMAIL_HOST_USER or 'noreply@smartcity.com',
-        [complaint.user.email],
-        fail_silently=False,
-    )
+    queue_notification(subject, message, [complaint.user.email])
 
 
 # Electricity Bill Views
+async def electricity_bills_state(request):
+    user = await arequest_user(request)
+    state = [
+        await aresource_state(ElectricityBill.objects.filter(user=user), 'updated_at'),
+        await aunread_state(request),
+    ]
+    if include_archive(request):
+        state.append(await aresource_state(ArchivedElectricityBill.objects.filter(user=user), 'archived_at'))
+    return state
+
+
 @login_required
-def electricity_bills(request):
-    # Show only the current user's bills
-    bills = ElectricityBill.objects.filter(user=request.user).order_by('-created_at')
+@conditional_page(electricity_bills_state)
+async def electricity_bills(request):
+    user = await arequest_user(request)
+    # Show only the current user's bills, plus archived ones on request.
+    # Archived bills always count towards the totals.
+    show_archive = include_archive(request)
+    querysets = [
+        (ElectricityBill.objects.filter(user=user), True),
+        (ArchivedElectricityBill.objects.filter(user=user), show_archive),
+    ]
     
     # Search functionality
     search_query = request.GET.get('search', '')
     status_filter = request.GET.get('status', '')
     
-    if search_query:
-        bills = bills.filter(
-            Q(bill_number__icontains=search_query) |
-            Q(consumer_name__icontains=search_query)
-        )
-    
-    if status_filter:
-        bills = bills.filter(status=status_filter)
-    
-    # Get user's personal statistics
-    user_total = bills.count()
-    user_due = bills.filter(status='Due').count()
-    user_cleared = bills.filter(status='Cleared').count()
-    user_amount = sum(bill.amount for bill in bills)
+    bill_list = []
+    all_totals = []
+    for bills, listed in querysets:
+        bills = bills.select_related('user').order_by('-created_at')
+        if search_query:
+            bills = await asearch_bills(bills, search_query)
+        if status_filter:
+            bills = bills.filter(status=status_filter)
+        # Get user's personal statistics
+        all_totals.append(await bills.atotals())
+        if listed:
+            bill_list.extend([bill async for bill in bills])
+    totals = merge_totals(*all_totals)
+    if show_archive:
+        bill_list.sort(key=lambda bill: bill.created_at, reverse=True)
     
     context = {
-        'bills': bills,
-        'user_total': user_total,
-        'user_due': user_due,
-        'user_cleared': user_cleared,
-        'user_amount': user_amount,
+        'bills': bill_list,
+        'show_archive': show_archive,
+        'user_total': totals['total'],
+        'user_due': totals['due'],
+        'user_cleared': totals['cleared'],
+        'user_amount': totals['total_amount'],
+        'user_due_amount': totals['due_amount'],
+        'user_cleared_amount': totals['cleared_amount'],
         'search_query': search_query,
         'status_filter': status_filter,
     }
-    return render(request, 'electricity_bills.html', context)
+    return await arender(request, 'electricity_bills.html', context)
 
 
 @login_required
@@ -273,14 +480,76 @@ def mark_bill_cleared(request, bill_id):
     return render(request, 'mark_bill_cleared.html', {'bill': bill})
 
 
+def admin_electricity_bills_state(request):
+    if not request.user.is_staff:
+        return None
+    state = [resource_state(ElectricityBill.objects.all(), 'updated_at'), unread_state(request)]
+    if include_archive(request):
+        state.append(resource_state(ArchivedElectricityBill.objects.all(), 'archived_at'))
+    return state
+
+
 @login_required
+@replica_reads
+@conditional_page(admin_electricity_bills_state)
 def admin_electricity_bills(request):
     if not request.user.is_staff:
         messages.error(request, 'Access denied. Admin privileges required.')
         return redirect('electricity_bills')
     
-    bills = ElectricityBill.objects.all()
-    return render(request, 'admin_electricity_bills.html', {'bills': bills})
+    bills = filter_bills(ElectricityBill.objects.select_related('user'), request.GET)
+    status_filter = request.GET.get('status', '')
+    show_archive = include_archive(request)
+    # City-wide totals: archived bills still count as cleared
+    totals = merge_totals(ElectricityBill.objects.totals(), ArchivedElectricityBill.objects.totals())
+    archived = ()
+    if show_archive:
+        archived = [filter_bills(ArchivedElectricityBill.objects.select_related('user'), request.GET)]
+    
+    page = keyset_paginate(bills, request.GET.get('cursor'), merge=archived)
+    context = {
+        'bills': page,
+        'page': page,
+        'next_query': page_querystring(request.GET, page.next_cursor),
+        'first_query': page_querystring(request.GET, None),
+        'status_filter': status_filter,
+        'show_archive': show_archive,
+        'totals': totals,
+    }
+    return render(request, 'admin_electricity_bills.html', context)
+
+
+@login_required
+def export_complaints(request):
+    """Stream every complaint matching the dashboard filters as CSV or NDJSON"""
+    if not request.user.is_staff:
+        messages.error(request, 'Access denied. Admin privileges required.')
+        return redirect('citizen_dashboard')
+    
+    # Streamed after the view returns, so pinned explicitly
+    database = read_database(request)
+    complaints = filter_complaints(Complaint.objects.using(database).order_by('id'), request.GET)
+    archived = ()
+    if include_archive(request):
+        archived = [filter_complaints(ArchivedComplaint.objects.using(database).order_by('id'), request.GET)]
+    return stream_export(request, complaints, COMPLAINT_EXPORT_FIELDS, 'complaints',
+                         request.GET.get('format', 'csv'), merge=archived)
+
+
+@login_required
+def export_bills(request):
+    """Stream every bill matching the admin list filters as CSV or NDJSON"""
+    if not request.user.is_staff:
+        messages.error(request, 'Access denied. Admin privileges required.')
+        return redirect('electricity_bills')
+    
+    database = read_database(request)
+    bills = filter_bills(ElectricityBill.objects.using(database).order_by('id'), request.GET)
+    archived = ()
+    if include_archive(request):
+        archived = [filter_bills(ArchivedElectricityBill.objects.using(database).order_by('id'), request.GET)]
+    return stream_export(request, bills, BILL_EXPORT_FIELDS, 'electricity_bills',
+                         request.GET.get('format', 'csv'), merge=archived)
 
 
 @login_required
@@ -289,7 +558,7 @@ def admin_edit_electricity_bill(request, bill_id):
         messages.error(request, 'Access denied. Admin privileges required.')
         return redirect('electricity_bills')
     
-    bill = get_object_or_404(ElectricityBill, id=bill_id)
+    bill = get_object_or_404(ElectricityBill.objects.select_related('user'), id=bill_id)
     old_status = bill.status
     
     if request.method == 'POST':
@@ -312,7 +581,7 @@ def admin_delete_electricity_bill(request, bill_id):
         messages.error(request, 'Access denied. Admin privileges required.')
         return redirect('electricity_bills')
     
-    bill = get_object_or_404(ElectricityBill, id=bill_id)
+    bill = get_object_or_404(ElectricityBill.objects.select_related('user'), id=bill_id)
     if request.method == 'POST':
         bill.delete()
         messages.success(request, 'Electricity bill deleted successfully!')
@@ -321,7 +590,7 @@ def admin_delete_electricity_bill(request, bill_id):
 
 
 def send_bill_status_notification(bill):
-    """Send email notification when bill status changes"""
+    """Queue email notification when bill status changes"""
     subject = f'Electricity Bill Status Update: {bill.bill_number}'
     message = f'''
 Dear {bill.user.first_name},
@@ -340,39 +609,62 @@ Thank you for using Smart City System.
 Best regards,
 Smart City Administration
     '''
-    send_mail(
-        subject,
-        message,
-        settings.EMAIL_HOST_USER or 'noreply@smartcity.com',
-        [bill.user.email],
-        fail_silently=False,
-    )
+    queue_notification(subject, message, [bill.user.email])
 
 
 # Message Views
+async def user_messages_state(request):
+    user = await arequest_user(request)
+    return [
+        await aresource_state(Message.objects.filter(recipient=user), 'created_at', 'read_at'),
+        await aunread_state(request),
+    ]
+
+
 @login_required
-def user_messages(request):
+@replica_reads
+@conditional_page(user_messages_state)
+async def user_messages(request):
     """View for users to see their received messages"""
-    user_messages = Message.objects.filter(recipient=request.user)
-    unread_count = user_messages.filter(is_read=False).count()
+    user = await arequest_user(request)
+    inbox = Message.objects.filter(recipient=user).select_related('sender')
     
+    # The unread count comes from the navbar context processor. Not called
+    # 'messages', which base.html renders as flash messages.
     context = {
-        'messages': user_messages,
-        'unread_count': unread_count,
+        'inbox': [message async for message in inbox],
     }
-    return render(request, 'user_messages.html', context)
+    return await arender(request, 'user_messages.html', context)
 
 
 @login_required
-def view_message(request, message_id):
+async def view_message(request, message_id):
     """View a specific message and mark it as read"""
-    message = get_object_or_404(Message, id=message_id, recipient=request.user)
-    message.mark_as_read()
+    user = await arequest_user(request)
+    message = await aget_object_or_404(Message.objects.select_related('sender'), id=message_id, recipient=user)
+    await message.amark_as_read()
     
     context = {
         'message': message,
     }
-    return render(request, 'view_message.html', context)
+    return await arender(request, 'view_message.html', context)
+
+
+@login_required
+def mark_messages_read(request):
+    """Mark the selected messages, or all of them, as read in one update"""
+    if request.method != 'POST':
+        return redirect('user_messages')
+    
+    inbox = Message.objects.filter(recipient=request.user)
+    if not request.POST.get('all'):
+        message_ids = [value for value in request.POST.getlist('message_ids') if value.isdigit()]
+        inbox = inbox.filter(id__in=message_ids)
+    
+    updated = inbox.mark_as_read()
+    if updated:
+        messages.success(request, f'Marked {updated} message(s) as read.')
+    return redirect('user_messages')
 
 
 @login_required
@@ -397,15 +689,75 @@ def send_message(request):
 
 
 @login_required
+def send_broadcast(request):
+    """View for admins to send one message to a whole segment of users"""
+    if not request.user.is_staff:
+        messages.error(request, 'Only administrators can send messages.')
+        return redirect('home')
+    
+    if request.method == 'POST':
+        form = BroadcastMessageForm(request.POST)
+        if form.is_valid():
+            data = form.cleaned_data
+            sent = broadcast_message(
+                request.user,
+                data['segment'],
+                data['subject'],
+                data['content'],
+                data['priority'],
+                category=data['category'] or None,
+            )
+            messages.success(request, f'Broadcast sent to {sent} user(s).')
+            return redirect('admin_messages')
+    else:
+        form = BroadcastMessageForm()
+    
+    return render(request, 'broadcast_message.html', {'form': form})
+
+
+@login_required
+def recipient_autocomplete(request):
+    """Return up to 10 citizens matching the typed username or email"""
+    if not request.user.is_staff:
+        return JsonResponse({'results': []}, status=403)
+    
+    query = request.GET.get('q', '').strip()
+    results = []
+    if query:
+        users = (
+            User.objects.filter(is_staff=False)
+            .filter(Q(username__istartswith=query) | Q(email__istartswith=query))
+            .order_by('username')
+            .only('username', 'first_name', 'last_name', 'email')[:10]
+        )
+        results = [
+            {'username': user.username, 'name': user.get_full_name(), 'email': user.email}
+            for user in users
+        ]
+    return JsonResponse({'results': results})
+
+
+def admin_messages_state(request):
+    if not request.user.is_staff:
+        return None
+    return [
+        resource_state(Message.objects.filter(sender=request.user), 'created_at', 'read_at'),
+        unread_state(request),
+    ]
+
+
+@login_required
+@replica_reads
+@conditional_page(admin_messages_state)
 def admin_messages(request):
     """View for admins to see all sent messages"""
     if not request.user.is_staff:
         messages.error(request, 'Only administrators can access this page.')
         return redirect('home')
     
-    sent_messages = Message.objects.filter(sender=request.user)
+    sent_messages = Message.objects.filter(sender=request.user).select_related('recipient')
     
     context = {
-        'messages': sent_messages,
+        'sent_messages': sent_messages,
     }
     return render(request, 'admin_messages.html', context)
\ No newline at end of file
@@ -0,0 +1,24 @@
+#!/usr/bin/env bash
+# Start the web server. SERVER_MODE=asgi runs the ASGI application under
+# uvicorn workers (async views run on the event loop); the default runs
+# the classic sync WSGI workers.
+set -o errexit
+
+# Fail fast, before taking traffic, if the database is unreachable or the
+# workers' connection pools would not fit its max_connections.
+databases="--database default"
+if [ -n "${READ_REPLICA_URL:-}" ]; then
+    databases="$databases --database replica"
+fi
+python manage.py check $databases
+
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+    exec gunicorn SmartCitySystem.asgi:application \
+        --worker-class uvicorn_worker.UvicornWorker \
+        --workers "${WEB_CONCURRENCY:-2}" \
+        --bind "0.0.0.0:${PORT:-8000}"
+else
+    exec gunicorn SmartCitySystem.wsgi:application \
+        --workers "${WEB_CONCURRENCY:-2}" \
+        --bind "0.0.0.0:${PORT:-8000}"
+fi
@@ -0,0 +1,92 @@
+// Add loading states to buttons (excluding form submit buttons)
+document.addEventListener('DOMContentLoaded', function() {
+    const buttons = document.querySelectorAll('.btn:not([type="submit"])');
+    buttons.forEach(button => {
+        button.addEventListener('click', function() {
+            if (this.type !== 'submit' && !this.href.includes('#')) {
+                const spinner = document.createElement('span');
+                spinner.className = 'loading-spinner me-2';
+                this.insertBefore(spinner, this.firstChild);
+                this.disabled = true;
+            }
+        });
+    });
+
+    // Add smooth scrolling
+    document.querySelectorAll('a[href^="#"]').forEach(anchor => {
+        anchor.addEventListener('click', function (e) {
+            e.preventDefault();
+            const target = document.querySelector(this.getAttribute('href'));
+            if (target) {
+                target.scrollIntoView({
+                    behavior: 'smooth',
+                    block: 'start'
+                });
+            }
+        });
+    });
+
+    // Add intersection observer for animations
+    const observerOptions = {
+        threshold: 0.1,
+        rootMargin: '0px 0px -50px 0px'
+    };
+
+    const observer = new IntersectionObserver(function(entries) {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                entry.target.classList.add('fade-in');
+            }
+        });
+    }, observerOptions);
+
+    document.querySelectorAll('.card, .stat-card').forEach(card => {
+        observer.observe(card);
+    });
+
+    // Debug dropdown functionality
+    console.log('Bootstrap loaded:', typeof bootstrap !== 'undefined');
+
+    // Test dropdown click
+    const dropdownToggle = document.querySelector('.dropdown-toggle');
+    if (dropdownToggle) {
+        dropdownToggle.addEventListener('click', function(e) {
+            console.log('Dropdown clicked!');
+            // Don't prevent default - let Bootstrap handle it
+        });
+    }
+
+    // Initialize Bootstrap dropdowns manually if needed
+    const dropdownElementList = [].slice.call(document.querySelectorAll('.dropdown-toggle'));
+    const dropdownList = dropdownElementList.map(function (dropdownToggleEl) {
+        return new bootstrap.Dropdown(dropdownToggleEl);
+    });
+
+    console.log('Dropdowns initialized:', dropdownList.length);
+
+    // Add smooth animations to dropdown items
+    const dropdownItems = document.querySelectorAll('.dropdown-item');
+    dropdownItems.forEach((item, index) => {
+        item.style.animationDelay = `${index * 0.1}s`;
+        item.classList.add('fade-in');
+    });
+
+    // Add proper form submission loading states
+    const forms = document.querySelectorAll('form');
+    forms.forEach(form => {
+        form.addEventListener('submit', function() {
+            const submitBtn = this.querySelector('button[type="submit"]');
+            if (submitBtn) {
+                const originalText = submitBtn.innerHTML;
+                submitBtn.innerHTML = '<span class="spinner-border spinner-border-sm me-2" role="status" aria-hidden="true"></span>Processing...';
+                submitBtn.disabled = true;
+
+                // Re-enable after 10 seconds as fallback
+                setTimeout(() => {
+                    submitBtn.innerHTML = originalText;
+                    submitBtn.disabled = false;
+                }, 10000);
+            }
+        });
+    });
+});